@@ -0,0 +1,116 @@
+// Persistent opt -O2 + llc -O2 worker for the evolve benchmark loop.
+//
+// Usage: evolve-worker [evolved cl::opt flags...]
+//
+// Reads one "<input.bc>\t<output.o>" request per stdin line, runs the -O2
+// module pipeline and object emission in-process, and answers "ok" or
+// "error <message>" on stdout. The flags are parsed once at startup, so
+// llvm_bench.py keeps one worker per distinct flag set.
+//
+// Equivalent to:
+//   opt -O2 <flags> in.bc -o - | llc -O2 -filetype=obj -relocation-model=pic -o out.o
+//
+// Requires LLVM 18+ (CodeGenOptLevel / CodeGenFileType enums).
+#include "llvm/Analysis/CGSCCPassManager.h"
+#include "llvm/Analysis/LoopAnalysisManager.h"
+#include "llvm/Config/llvm-config.h"
+#include "llvm/IR/LLVMContext.h"
+#include "llvm/IR/LegacyPassManager.h"
+#include "llvm/IR/Module.h"
+#include "llvm/IRReader/IRReader.h"
+#include "llvm/MC/TargetRegistry.h"
+#include "llvm/Passes/PassBuilder.h"
+#include "llvm/Support/CommandLine.h"
+#include "llvm/Support/FileSystem.h"
+#include "llvm/Support/InitLLVM.h"
+#include "llvm/Support/SourceMgr.h"
+#include "llvm/Support/TargetSelect.h"
+#include "llvm/Support/raw_ostream.h"
+#include "llvm/Target/TargetMachine.h"
+#include "llvm/TargetParser/Host.h"
+
+#include <iostream>
+#include <memory>
+#include <optional>
+#include <string>
+
+using namespace llvm;
+
+static std::string compileOne(const std::string &BCPath, const std::string &ObjPath) {
+    LLVMContext Ctx;
+    SMDiagnostic Diag;
+    std::unique_ptr<Module> M = parseIRFile(BCPath, Diag, Ctx);
+    if (!M) {
+        std::string Msg;
+        raw_string_ostream OS(Msg);
+        Diag.print("evolve-worker", OS, /*ShowColors=*/false);
+        return OS.str();
+    }
+
+#if LLVM_VERSION_MAJOR >= 21
+    Triple TT = M->getTargetTriple();
+    if (TT.str().empty())
+        TT = Triple(sys::getDefaultTargetTriple());
+#else
+    std::string TT = M->getTargetTriple();
+    if (TT.empty())
+        TT = sys::getDefaultTargetTriple();
+#endif
+    std::string Err;
+    const Target *T = TargetRegistry::lookupTarget(TT, Err);
+    if (!T)
+        return Err;
+    std::unique_ptr<TargetMachine> TM(T->createTargetMachine(
+        TT, /*CPU=*/"", /*Features=*/"", TargetOptions(), Reloc::PIC_,
+        std::nullopt, CodeGenOptLevel::Default));
+    M->setDataLayout(TM->createDataLayout());
+
+    // opt -O2
+    LoopAnalysisManager LAM;
+    FunctionAnalysisManager FAM;
+    CGSCCAnalysisManager CGAM;
+    ModuleAnalysisManager MAM;
+    PassBuilder PB(TM.get());
+    PB.registerModuleAnalyses(MAM);
+    PB.registerCGSCCAnalyses(CGAM);
+    PB.registerFunctionAnalyses(FAM);
+    PB.registerLoopAnalyses(LAM);
+    PB.crossRegisterProxies(LAM, FAM, CGAM, MAM);
+    PB.buildPerModuleDefaultPipeline(OptimizationLevel::O2).run(*M, MAM);
+
+    // llc -O2 -filetype=obj
+    std::error_code EC;
+    raw_fd_ostream Out(ObjPath, EC, sys::fs::OF_None);
+    if (EC)
+        return EC.message();
+    legacy::PassManager CodeGen;
+    if (TM->addPassesToEmitFile(CodeGen, Out, nullptr, CodeGenFileType::ObjectFile))
+        return "target cannot emit object files";
+    CodeGen.run(*M);
+    Out.flush();
+    return "";
+}
+
+int main(int argc, char **argv) {
+    InitLLVM X(argc, argv);
+    InitializeNativeTarget();
+    InitializeNativeTargetAsmPrinter();
+    cl::ParseCommandLineOptions(argc, argv, "evolve benchmark worker\n");
+
+    std::string Line;
+    while (std::getline(std::cin, Line)) {
+        size_t Tab = Line.find('\t');
+        std::string Err = Tab == std::string::npos
+            ? "malformed request"
+            : compileOne(Line.substr(0, Tab), Line.substr(Tab + 1));
+        if (Err.empty()) {
+            std::cout << "ok\n";
+        } else {
+            for (char &C : Err)
+                if (C == '\n') C = ' ';
+            std::cout << "error " << Err << "\n";
+        }
+        std::cout.flush();
+    }
+    return 0;
+}
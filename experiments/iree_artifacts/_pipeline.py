@@ -0,0 +1,254 @@
+"""Shared FP32 export + static INT8 (QDQ) quantization for the IREE examples.
+
+Usage (from experiments/iree_artifacts/):
+    python -m _pipeline                      # both example models, one interpreter
+    python -m _pipeline --model fc           # just SimpleMatMulNet
+    python -m _pipeline --fp32-only          # export only, never imports onnxruntime
+
+The example scripts can still be run on their own:
+    python example_onnx_fc.py [--fp32-only]
+
+They exit before importing torch/onnx when the quantized model is already
+newer than the script (set FORCE_REBUILD=1 to rebuild anyway). numpy, onnx
+and torch are therefore imported inside the functions that need them.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+# Canonical description of the quantization settings; part of the cache key.
+QUANT_OPTIONS = {
+    "quant_format": "QDQ",
+    "activation_type": "QInt8",
+    "weight_type": "QInt8",
+    "extra_options": {"ActivationSymmetric": True, "WeightSymmetric": True},
+}
+
+
+def parse_args(argv=None, with_model=False):
+    parser = argparse.ArgumentParser(description="Export + quantize example ONNX models")
+    if with_model:
+        parser.add_argument("--model", choices=["fc", "hybrid", "all"], default="all",
+                            help="Which example model to build (default: all)")
+    parser.add_argument("--fp32-only", action="store_true",
+                        help="Only export the FP32 model (skips onnxruntime)")
+    return parser.parse_args(argv)
+
+
+def quant_onnx_path(model_name, out_dir=None):
+    out_dir = out_dir or f"compilation_{model_name}"
+    return os.path.join(out_dir, f"{model_name}_int8_sym.onnx")
+
+
+def fresh_artifact(model_name, script, out_dir=None):
+    """Return the quantized model path if it is newer than *script* and this
+    module, else None. Only stats files; safe to call before heavy imports."""
+    if os.getenv("FORCE_REBUILD"):
+        return None
+    path = quant_onnx_path(model_name, out_dir)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if mtime < max(os.path.getmtime(script), os.path.getmtime(__file__)):
+        return None
+    return path
+
+
+# Typed payload fields that conflict with raw_data ("one and only one value")
+_CLEAR_FIELDS = ("float_data", "int32_data", "int64_data", "double_data")
+
+
+# --- Quantization (cached) ---
+def cached_quantize_static(fp32_path, output_path, cache_dir, calib_samples):
+    """Run quantize_static, reusing a previous result for identical inputs.
+
+    *calib_samples* is a contiguous float32 array of shape ``(n, *input_shape)``.
+
+    The key hashes the FP32 model bytes, the calibration samples and
+    QUANT_OPTIONS. On a hit the cached model, which already carries the
+    calibrated scales, is copied to *output_path* and calibration is skipped.
+    The cached model is stored as quantize_static wrote it; sanitizing is
+    fused into the externalize pass in :func:`sanitize_and_externalize`.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(fp32_path, "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps(QUANT_OPTIONS, sort_keys=True).encode())
+    h.update(memoryview(calib_samples))  # contiguous buffer, hashed without a copy
+    entry_dir = os.path.join(cache_dir, h.hexdigest())
+    cached_model = os.path.join(entry_dir, "temp_quant.onnx")
+
+    if os.path.exists(cached_model):
+        print(f"Calibration cache hit ({entry_dir}), skipping quantize_static")
+        shutil.copy2(cached_model, output_path)
+        return
+
+    # Heavy import kept local so --fp32-only runs never load onnxruntime
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static,
+    )
+
+    class RandomDataReader(CalibrationDataReader):
+        def __init__(self, samples):
+            # Iterating the (n, *shape) buffer yields views, no per-sample copies
+            self._it = iter(samples)
+        def get_next(self):
+            nxt = next(self._it, None)
+            return {'input': nxt} if nxt is not None else None
+
+    quantize_static(
+        model_input=fp32_path,
+        model_output=output_path,
+        calibration_data_reader=RandomDataReader(calib_samples),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        extra_options={'ActivationSymmetric': True, 'WeightSymmetric': True}
+    )
+
+    os.makedirs(entry_dir, exist_ok=True)
+    shutil.copy2(output_path, cached_model)
+
+
+# --- THE FIX: Aggressive Sanitization ---
+def sanitize_and_externalize(model, out_dir, location, size_threshold=1024):
+    """Sanitize every tensor and move large initializer weights to *location*.
+
+    Sanitizing ensures no TensorProto has conflicting data fields: when
+    ``raw_data`` is present the typed fields are wiped, which prevents
+    "one and only one value" errors downstream.
+
+    One walk over the model: initializers are sanitized and, when their
+    raw_data is at least *size_threshold* bytes, appended to a single
+    external file kept open for the whole loop; tensor attributes
+    (Constant nodes) are only sanitized and stay inline. The external
+    layout matches ``onnx.save(save_as_external_data=True,
+    all_tensors_to_one_file=True, convert_attribute=False)``.
+    """
+    from onnx import TensorProto
+    from onnx.external_data_helper import (
+        _get_attribute_tensors, _get_initializer_tensors, set_external_data,
+    )
+
+    with open(os.path.join(out_dir, location), "wb") as f:
+        for t in _get_initializer_tensors(model):
+            raw = t.raw_data
+            if not raw:
+                continue
+            for field in _CLEAR_FIELDS:
+                t.ClearField(field)
+            if len(raw) >= size_threshold:
+                set_external_data(t, location, offset=f.tell(), length=len(raw))
+                f.write(raw)
+                t.data_location = TensorProto.EXTERNAL
+                t.ClearField("raw_data")
+    for t in _get_attribute_tensors(model):
+        if t.raw_data:
+            for field in _CLEAR_FIELDS:
+                t.ClearField(field)
+    return model
+
+
+def export_fp32(model, dummy_input, path):
+    """Export with the TorchDynamo exporter, falling back to the legacy tracer."""
+    import torch
+
+    export_kwargs = dict(
+        input_names=["input"], output_names=["output"],
+        opset_version=17,
+        do_constant_folding=True,
+    )
+    # No autograd graph is needed for export
+    with torch.inference_mode():
+        try:
+            torch.onnx.export(model, (dummy_input,), path, dynamo=True, **export_kwargs)
+        except Exception as e:  # older torch (no dynamo kwarg) or unsupported op
+            print(f"Dynamo export failed ({type(e).__name__}: {e}); using legacy exporter")
+            torch.onnx.export(model, (dummy_input,), path, **export_kwargs)
+
+
+def export_and_quantize(model, dummy_input, model_name, out_dir=None, fp32_only=False):
+    """Export *model* to FP32 ONNX, then quantize to symmetric INT8 QDQ.
+
+    Weights above 1 KB are split into ``<model_name>.data``; tiny shape
+    tensors stay inline. Returns the path of the final ONNX model.
+    """
+    import numpy as np
+    import onnx
+
+    out_dir = out_dir or f"compilation_{model_name}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    fp32_onnx_path = os.path.join(out_dir, f"{model_name}_fp32.onnx")
+    quant_path = quant_onnx_path(model_name, out_dir)
+    external_data_file = f"{model_name}.data"
+    temp_quant_path = os.path.join(out_dir, "temp_quant.onnx")
+
+    # 1. Export FP32
+    print(f"Exporting FP32 to {fp32_onnx_path}...")
+    export_fp32(model, dummy_input, fp32_onnx_path)
+    if fp32_only:
+        print(f"FP32 only: {fp32_onnx_path}")
+        return fp32_onnx_path
+
+    # 2. Quantize
+    print("Quantizing...")
+    # Seeded so identical reruns produce identical calibration data (cache hits)
+    # One contiguous (n, *shape) buffer filled in place
+    calib_samples = np.empty((5,) + tuple(dummy_input.shape), dtype=np.float32)
+    np.random.default_rng(0).standard_normal(dtype=np.float32, out=calib_samples)
+    cached_quantize_static(fp32_onnx_path, temp_quant_path,
+                           os.path.join(out_dir, ".quant_cache"), calib_samples)
+
+    # 3. Final Conversion and Save
+    try:
+        print("Loading...")
+        # quantize_static writes weights inline; nothing external to pull in
+        onnx_model = onnx.load(temp_quant_path, load_external_data=False)
+
+        ext_path_full = os.path.join(out_dir, external_data_file)
+
+        # Convert to External Data with Threshold (overwrites any old .data file)
+        # This keeps tiny shape tensors inside the ONNX file, moves weights to .data
+        print(f"Splitting weights to {external_data_file}...")
+        sanitize_and_externalize(
+            onnx_model, out_dir, external_data_file,
+            size_threshold=1024,  # <--- Critical: Keeps shape tensors inline
+        )
+        onnx.save(onnx_model, quant_path)
+    finally:
+        # Cleanup temp file
+        try:
+            os.unlink(temp_quant_path)
+        except FileNotFoundError:
+            pass
+
+    print("------------------------------------------------")
+    print("SUCCESS.")
+    print(f"Model:   {quant_path}")
+    print(f"Weights: {ext_path_full}")
+    print("\nNow run:")
+    print(f"iree-import-onnx {quant_path} --opset-version 17 -o {model_name}.mlir")
+    return quant_path
+
+
+def main(argv=None):
+    args = parse_args(argv, with_model=True)
+    # Import lazily: the example modules import this one
+    import example_onnx_fc
+    import example_onnx_model
+
+    examples = {"fc": example_onnx_fc, "hybrid": example_onnx_model}
+    names = list(examples) if args.model == "all" else [args.model]
+    for name in names:
+        ex = examples[name]
+        model, dummy_input = ex.build()
+        export_and_quantize(model, dummy_input, ex.MODEL_NAME, fp32_only=args.fp32_only)
+
+
+if __name__ == "__main__":
+    main()
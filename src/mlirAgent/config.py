@@ -1,6 +1,8 @@
 import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,9 +21,12 @@ _PROFILES = {
     },
 }
 
+# mlirEvolve repo root (src/mlirAgent/config.py -> parents[2]), resolved once
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 def _auto_detect_merlin_root():
     """Walk up from this file to find merlin root, with profile override."""
-    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    return str(_PROJECT_ROOT.parent)
 
 def _get_profile():
     """Return the active profile dict based on MERLIN_PROFILE env var."""
@@ -34,61 +39,105 @@ def _get_profile():
 
 _profile = _get_profile()
 
-class Config:
+_VALIDATED = False
+
+@dataclass(frozen=True, slots=True)
+class _Config:
     # --- Source Paths ---
     # We need the source to run CMake!
     # Set MERLIN_PROFILE=agustin|ashvin or override individual env vars.
-    _MERLIN_ROOT = os.getenv("MERLIN_ROOT", _profile["merlin_root"])
-    IREE_SRC_PATH = os.getenv("IREE_SRC_PATH", os.path.join(_MERLIN_ROOT, "third_party", "iree_bar"))
-    LLVM_SRC_PATH = os.getenv("LLVM_SRC_PATH", os.path.join(IREE_SRC_PATH, "third_party", "llvm-project"))
+    _MERLIN_ROOT: str
+    IREE_SRC_PATH: str
+    LLVM_SRC_PATH: str
 
     # --- Build Paths ---
-    BUILD_DIR = os.getenv("BUILD_DIR", _profile["build_dir"])
-    INSTALL_DIR = os.path.join(BUILD_DIR, "install") # Derived from build dir
-    
+    BUILD_DIR: str
+    INSTALL_DIR: str
+
     # --- Binaries ---
-    BUILD_LLVM_DIR = os.getenv("BUILD_LLVM_DIR", os.path.join(BUILD_DIR, "llvm-project"))
-    LLVM_LIT_PATH = os.getenv("LLVM_LIT_PATH", os.path.join(BUILD_LLVM_DIR, "bin", "lit"))
-    FILECHECK_PATH = os.getenv("FILECHECK_PATH", os.path.join(BUILD_LLVM_DIR, "bin", "FileCheck"))
-    
-    BUILD_TOOLS_DIR = os.getenv("BUILD_TOOLS_DIR", os.path.join(BUILD_DIR, "tools"))
-    IREE_COMPILE_PATH = os.getenv("IREE_COMPILE_PATH", os.path.join(BUILD_TOOLS_DIR, "iree-compile"))
-    
+    BUILD_LLVM_DIR: str
+    LLVM_LIT_PATH: str
+    FILECHECK_PATH: str
+
+    BUILD_TOOLS_DIR: str
+    IREE_COMPILE_PATH: str
+
     # --- Evolve Harness ---
-    EVOLVE_CONFIGS_DIR = os.getenv("EVOLVE_CONFIGS_DIR", os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "configs"))
-    OPENEVOLVE_PATH = os.getenv("OPENEVOLVE_PATH", os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "third_party", "openevolve"))
+    EVOLVE_CONFIGS_DIR: str
+    OPENEVOLVE_PATH: str
 
     # --- Agent Data ---
-    PROJECT_ROOT = Path(__file__).parent.parent.parent
-    ARTIFACTS_DIR = PROJECT_ROOT / "data" / "artifacts"
-    RECIPES_DIR = PROJECT_ROOT / "data" / "cookbook" / "LLVM_recipes"
-    
+    PROJECT_ROOT: Path
+    ARTIFACTS_DIR: Path
+    RECIPES_DIR: Path
+
     # Neo4j Configuration
-    NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-    
+    NEO4J_URI: str
+
     # LanceDB
-    LANCEDB_DIR = PROJECT_ROOT / "data" / "lancedb"
-    
+    LANCEDB_DIR: Path
+
     # --- .emv Variables ---
     # OpenAI API Key
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_API_KEY: Optional[str]
     # Neo4j Credentials
-    NEO4J_USER = os.getenv("NEO4J_USER")
-    NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-    
-    @classmethod
-    def validate(cls):
-        """Ensures the environment is set up correctly."""
-        os.makedirs(cls.ARTIFACTS_DIR, exist_ok=True)
-
-        if not os.path.exists(cls.IREE_SRC_PATH):
-             print(f"⚠️  WARNING: Source path not found at {cls.IREE_SRC_PATH}. 'reconfigure=True' will fail.")
-
-        ninja_file = os.path.join(cls.BUILD_DIR, "build.ninja")
+    NEO4J_USER: Optional[str]
+    NEO4J_PASSWORD: Optional[str]
+
+    def validate(self):
+        """Ensures the environment is set up correctly.
+
+        Not run at import; entry points call it once. Forked workers inherit
+        the flag, spawned ones the env var, and both skip the checks.
+        """
+        global _VALIDATED
+        if _VALIDATED or os.environ.get("MLIR_AGENT_VALIDATED"):
+            return
+        os.makedirs(self.ARTIFACTS_DIR, exist_ok=True)
+
+        if not os.path.exists(self.IREE_SRC_PATH):
+             print(f"⚠️  WARNING: Source path not found at {self.IREE_SRC_PATH}. 'reconfigure=True' will fail.")
+
+        ninja_file = os.path.join(self.BUILD_DIR, "build.ninja")
         if not os.path.exists(ninja_file):
             print(f"⚠️  WARNING: No 'build.ninja' found. Agent must run `reconfigure=True`.")
+        os.environ["MLIR_AGENT_VALIDATED"] = "1"
+        _VALIDATED = True
+
+
+def _build_config() -> _Config:
+    """Resolve every path and env override exactly once."""
+    merlin_root = os.getenv("MERLIN_ROOT", _profile["merlin_root"])
+    iree_src = os.getenv("IREE_SRC_PATH", os.path.join(merlin_root, "third_party", "iree_bar"))
+    build_dir = os.getenv("BUILD_DIR", _profile["build_dir"])
+    build_llvm_dir = os.getenv("BUILD_LLVM_DIR", os.path.join(build_dir, "llvm-project"))
+    build_tools_dir = os.getenv("BUILD_TOOLS_DIR", os.path.join(build_dir, "tools"))
+    project_root = _PROJECT_ROOT
+    repo_root = str(project_root)
+
+    return _Config(
+        _MERLIN_ROOT=merlin_root,
+        IREE_SRC_PATH=iree_src,
+        LLVM_SRC_PATH=os.getenv("LLVM_SRC_PATH", os.path.join(iree_src, "third_party", "llvm-project")),
+        BUILD_DIR=build_dir,
+        INSTALL_DIR=os.path.join(build_dir, "install"),  # Derived from build dir
+        BUILD_LLVM_DIR=build_llvm_dir,
+        LLVM_LIT_PATH=os.getenv("LLVM_LIT_PATH", os.path.join(build_llvm_dir, "bin", "lit")),
+        FILECHECK_PATH=os.getenv("FILECHECK_PATH", os.path.join(build_llvm_dir, "bin", "FileCheck")),
+        BUILD_TOOLS_DIR=build_tools_dir,
+        IREE_COMPILE_PATH=os.getenv("IREE_COMPILE_PATH", os.path.join(build_tools_dir, "iree-compile")),
+        EVOLVE_CONFIGS_DIR=os.getenv("EVOLVE_CONFIGS_DIR", os.path.join(repo_root, "configs")),
+        OPENEVOLVE_PATH=os.getenv("OPENEVOLVE_PATH", os.path.join(repo_root, "third_party", "openevolve")),
+        PROJECT_ROOT=project_root,
+        ARTIFACTS_DIR=project_root / "data" / "artifacts",
+        RECIPES_DIR=project_root / "data" / "cookbook" / "LLVM_recipes",
+        NEO4J_URI=os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        LANCEDB_DIR=project_root / "data" / "lancedb",
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY"),
+        NEO4J_USER=os.getenv("NEO4J_USER"),
+        NEO4J_PASSWORD=os.getenv("NEO4J_PASSWORD"),
+    )
+
 
-# Run validation
-Config.validate()
\ No newline at end of file
+# Module-level singleton; attribute access stays `Config.BUILD_DIR` etc.
+Config = _build_config()
@@ -11,8 +11,6 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-import yaml
-
 from ..config import Config
 from .providers import load_agent_config
 
@@ -50,6 +48,9 @@ class OpenEvolveAdapter(FrameworkAdapter):
         self._result = None
 
     def launch(self, dry_run: bool = False, max_iterations: Optional[int] = None) -> Dict[str, Any]:
+        # Validate once here, before OpenEvolve spawns evaluator workers
+        Config.validate()
+
         # Ensure openevolve is importable
         oe_path = Config.OPENEVOLVE_PATH
         if oe_path not in sys.path:
@@ -1,27 +1,73 @@
+import hashlib
 import os
 import re
 import subprocess
+import tempfile
+import uuid
 import optuna
+from pathlib import Path
 from typing import Dict, Any
 from openevolve.evaluation_result import EvaluationResult
 
+from .tasks.llvm_bench import ccache_env, ninja_quiet_flags
+
+try:
+    from optuna.storages import JournalStorage
+    from optuna.storages.journal import JournalFileBackend as JournalFileStorage
+except ImportError:
+    # optuna < 4.0
+    from optuna.storages import JournalStorage, JournalFileStorage
+
+# Matches lines like: // [hyperparam]: name, type, min, max
+_HYPERPARAM_RE = re.compile(r"//\s*\[hyperparam\]:\s*([\w-]+),\s*(\w+),\s*(\d+),\s*(\d+)")
+# Score line printed by the benchmark script; matched on raw bytes
+_SCORE_RE = re.compile(rb"(?<!\w)score:\s*(-?[\d.]+(?:[eE][-+]?\d+)?)")
+# Optional intermediate metric (e.g. after each benchmark), reported to the pruner
+_PARTIAL_RE = re.compile(rb"partial_score:\s*(-?[\d.]+(?:[eE][-+]?\d+)?)")
+
 class MagellanEvaluator:
-    def __init__(self, llvm_build_dir, benchmark_script):
+    def __init__(self, llvm_build_dir, benchmark_script, work_dir=None, n_jobs=None):
         self.build_dir = llvm_build_dir
         self.benchmark_script = benchmark_script
+        # Per-trial scratch dirs and the Optuna journal live here so parallel
+        # trials never share artifacts. A default dir is removed with the
+        # evaluator.
+        self._tmp_dir = None
+        if work_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="magellan_")
+            work_dir = self._tmp_dir.name
+        self.work_dir = work_dir
+        # Concurrent trials contend for cores and skew each other's timings;
+        # only run them in parallel when asked to.
+        self.n_jobs = n_jobs or 1
+        # Evolutionary search re-proposes identical candidates; remember results
+        self._code_hash_to_score: Dict[bytes, EvaluationResult] = {}
+        # Same ccache location and size as the llvm_bench task builds
+        self._build_env = ccache_env(self.build_dir)
 
     def evaluate(self, code: str) -> EvaluationResult:
+        code_hash = hashlib.sha1(code.encode()).digest()
+        cached = self._code_hash_to_score.get(code_hash)
+        if cached is not None:
+            return cached
+
+        result = self._evaluate_uncached(code)
+        if result.error is None:
+            self._code_hash_to_score[code_hash] = result
+        return result
+
+    def _evaluate_uncached(self, code: str) -> EvaluationResult:
         # 1. Inject Code into LLVM Source
         self._inject_code(code)
 
         # 2. Compile LLVM (Incremental)
-        # We only rebuild the relevant library to save time
-        build_cmd = ["ninja", "-C", self.build_dir, "lib/Analysis/AEInlineAdvisor.o"]
-        if subprocess.run(build_cmd).returncode != 0:
+        # Rebuild the advisor object and relink the final tool (e.g., opt)
+        # in one ninja run so the build graph is only loaded once.
+        build_cmd = ["ninja"] + ninja_quiet_flags("ninja") + [
+            "-C", self.build_dir, "lib/Analysis/AEInlineAdvisor.o", "bin/opt",
+        ]
+        if subprocess.run(build_cmd, check=False, env=self._build_env).returncode != 0:
             return EvaluationResult(score=float('-inf'), error="Compilation Failed")
-        
-        # Link the final tool (e.g., opt or clang)
-        subprocess.run(["ninja", "-C", self.build_dir, "bin/opt"])
 
         # 3. Inner Loop: Hyperparameter Tuning (The Magellan "Secret Sauce")
         # Extract params defined in the C++ comments
@@ -32,9 +78,37 @@ class MagellanEvaluator:
             score = self._run_benchmark({})
             return EvaluationResult(score=score)
 
-        # Use Optuna to tune the exposed flags
-        study = optuna.create_study(direction="maximize")
-        study.optimize(lambda trial: self._objective(trial, params), n_trials=20)
+        # Use Optuna to tune the exposed flags. Trials are independent
+        # subprocess runs, so execute them concurrently; the journal storage
+        # keeps the study consistent across worker threads.
+        storage = JournalStorage(
+            JournalFileStorage(os.path.join(self.work_dir, "optuna_journal.log"))
+        )
+        # A fresh study per call: resuming a same-named study left in a reused
+        # work_dir would pile up trials and stop n_trials bounding the work.
+        code_id = hashlib.sha1(code.encode()).hexdigest()[:12]
+        study_name = f"magellan_{code_id}_{uuid.uuid4().hex[:8]}"
+        study = optuna.create_study(
+            direction="maximize", storage=storage,
+            study_name=study_name,
+            # Multivariate TPE models the (often correlated) flags jointly;
+            # the median pruner stops trials whose partial scores lag behind.
+            sampler=optuna.samplers.TPESampler(multivariate=True, group=True),
+            pruner=optuna.pruners.MedianPruner(n_startup_trials=3, n_warmup_steps=1),
+        )
+        # Split the (name, type, min, max) tuples once into parallel lists
+        # so each trial only zips over ready-made ints and flag prefixes.
+        names = [p[0] for p in params]
+        schema = (
+            names,
+            [int(p[2]) for p in params],
+            [int(p[3]) for p in params],
+            [f"-{n}=" for n in names],
+        )
+        study.optimize(
+            lambda trial: self._objective(trial, schema),
+            n_trials=20, n_jobs=self.n_jobs,
+        )
         
         best_score = study.best_value
         best_params = study.best_params
@@ -47,26 +121,79 @@ class MagellanEvaluator:
     def _objective(self, trial, params_schema):
         # Map trial suggestions to LLVM flags
         # e.g., -ae-inline-base-threshold=255
-        flags = []
-        for name, type_, min_v, max_v in params_schema:
-            val = trial.suggest_int(name, int(min_v), int(max_v))
-            flags.append(f"-{name}={val}")
-            
-        return self._run_benchmark(flags)
-
-    def _run_benchmark(self, flags):
-        # Execute the benchmark script with the tuned flags
+        names, lo, hi, prefixes = params_schema
+        suggest = trial.suggest_int
+        flags = [
+            prefix + str(suggest(name, min_v, max_v))
+            for name, min_v, max_v, prefix in zip(names, lo, hi, prefixes)
+        ]
+
+        trial_dir = os.path.join(self.work_dir, f"trial_{trial.number}")
+        return self._run_benchmark(flags, run_dir=trial_dir, trial=trial)
+
+    def _run_benchmark(self, flags, run_dir=None, trial=None):
+        # Execute the benchmark script with the tuned flags. Each trial runs
+        # in its own directory so concurrent runs don't clobber artifacts.
+        if run_dir is None:
+            run_dir = os.path.join(self.work_dir, "default")
+        os.makedirs(run_dir, exist_ok=True)
         cmd = [self.benchmark_script] + flags
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        # Parse output for binary size reduction or execution speed
-        return self._parse_score(result.stdout)
+        if trial is None:
+            # Keep stdout as bytes: no decode pass over potentially large logs
+            result = subprocess.run(cmd, capture_output=True, cwd=run_dir)
+            # Parse output for binary size reduction or execution speed
+            return self._parse_score(result.stdout)
+
+        # Stream stdout so partial scores reach the pruner while it runs
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, cwd=run_dir) as proc:
+            score = self._read_score(proc, trial)
+            proc.stdout.read()  # drain so the script never blocks on a full pipe
+        return float('-inf') if score is None else score
+
+    def _read_score(self, proc, trial):
+        """Read *proc* stdout up to the ``score:`` line and return its value.
+
+        ``partial_score:`` lines are reported to *trial*; if the pruner
+        rejects the trial the process is killed and TrialPruned raised.
+        Returns None if stdout ends without a score.
+        """
+        step = 0
+        for line in proc.stdout:
+            m = _SCORE_RE.search(line)
+            if m is not None:
+                return float(m.group(1))
+            if trial is None:
+                continue
+            m = _PARTIAL_RE.search(line)
+            if m is not None:
+                trial.report(float(m.group(1)), step)
+                step += 1
+                if trial.should_prune():
+                    proc.kill()
+                    proc.wait()
+                    raise optuna.TrialPruned()
+        return None
+
+    def _parse_score(self, stdout: bytes) -> float:
+        m = _SCORE_RE.search(stdout)
+        if m is None:
+            return float('-inf')
+        return float(m.group(1))
 
     def _extract_hyperparams(self, code):
-        # Regex to find lines like: // [hyperparam]: name, type, min, max
-        pattern = r"//\s*\[hyperparam\]:\s*([\w-]+),\s*(\w+),\s*(\d+),\s*(\d+)"
-        return re.findall(pattern, code)
+        return _HYPERPARAM_RE.findall(code)
 
     def _inject_code(self, code):
         target_path = "llvm-project/llvm/lib/Analysis/AEInlineAdvisor.cpp"
-        with open(target_path, "w") as f:
-            f.write(code)
\ No newline at end of file
+        # Leave the file (and its mtime) untouched when the candidate is
+        # byte-identical, so ninja has nothing to rebuild.
+        if os.path.exists(target_path):
+            with open(target_path) as f:
+                existing = f.read()
+            if hashlib.sha1(existing.encode()).digest() == hashlib.sha1(code.encode()).digest():
+                return
+        # Write a sibling temp file and swap it in atomically, so a concurrent
+        # ninja/compiler never reads a truncated source.
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        Path(tmp_path).write_text(code)
+        os.replace(tmp_path, target_path)
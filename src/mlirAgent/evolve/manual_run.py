@@ -14,10 +14,19 @@ Usage:
 
 import argparse
 import asyncio
+import glob
+import hashlib
+import inspect
+import itertools
 import json
 import os
+import re
+import shutil
 import sys
+import textwrap
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -32,33 +41,68 @@ from openevolve.controller import OpenEvolve
 from openevolve.llm.manual import create_manual_llm
 
 
-EXAMPLES = {
-    "function_minimization": {
+def _dumps(obj) -> bytes:
+    # stdlib json on purpose: one line per database.add is not worth a
+    # second encoder, and orjson writes inf/NaN scores as null
+    return json.dumps(obj, default=str).encode()
+
+
+def _task_example(task: str) -> dict:
+    task_dir = Path(__file__).parent / "tasks" / task
+    return {
+        "initial_program": str(task_dir / "initial.cpp"),
+        "evaluator": str(task_dir / "evaluate.py"),
+        "file_suffix": ".cpp",
+        "language": "cpp",
+    }
+
+
+# Built lazily: only the selected example's paths are ever constructed
+_EXAMPLE_BUILDERS = {
+    "function_minimization": lambda: {
         "initial_program": _OE_PATH + "/examples/function_minimization/initial_program.py",
         "evaluator": _OE_PATH + "/examples/function_minimization/evaluator.py",
         "file_suffix": ".py",
         "language": "python",
     },
-    "llvm_inlining": {
-        "initial_program": str(Path(__file__).parent / "tasks/llvm_inlining/initial.cpp"),
-        "evaluator": str(Path(__file__).parent / "tasks/llvm_inlining/evaluate.py"),
-        "file_suffix": ".cpp",
-        "language": "cpp",
-    },
-    "regalloc_priority": {
-        "initial_program": str(Path(__file__).parent / "tasks/regalloc_priority/initial.cpp"),
-        "evaluator": str(Path(__file__).parent / "tasks/regalloc_priority/evaluate.py"),
-        "file_suffix": ".cpp",
-        "language": "cpp",
-    },
+    "llvm_inlining": lambda: _task_example("llvm_inlining"),
+    "regalloc_priority": lambda: _task_example("regalloc_priority"),
 }
 
 
+def get_example(name: str) -> dict:
+    return _EXAMPLE_BUILDERS[name]()
+
+
+def list_examples() -> list:
+    return list(_EXAMPLE_BUILDERS)
+
+
+class _ManualLLMFactory:
+    """Picklable ``init_client`` carrying this run's prompts dir.
+
+    The prompts dir travels inside the config (and is pickled into worker
+    processes with it) and is handed to the client directly, never through
+    ``os.environ``, so concurrent runs in one process keep their own dirs.
+    """
+
+    def __init__(self, prompts_dir: str):
+        self.prompts_dir = prompts_dir
+
+    def __call__(self, *args, **kwargs):
+        if _MANUAL_LLM_TAKES_DIR:
+            return create_manual_llm(*args, prompts_dir=self.prompts_dir, **kwargs)
+        # Older ManualLLM: point the constructed client at this run's dir
+        client = create_manual_llm(*args, **kwargs)
+        client.prompts_dir = self.prompts_dir
+        return client
+
+
+_MANUAL_LLM_TAKES_DIR = "prompts_dir" in inspect.signature(create_manual_llm).parameters
+
+
 def _build_config(args, prompts_dir: str) -> OEConfig:
     """Build OpenEvolve config with ManualLLM injected."""
-    # Set env var so ManualLLM instances (including in worker processes) find the prompts dir
-    os.environ["MANUAL_LLM_PROMPTS_DIR"] = prompts_dir
-
     # Load framework YAML as base
     configs_dir = str(_MLIREVOLVE_ROOT / "configs")
     fw_yaml = os.path.join(configs_dir, "frameworks", "manual.yaml")
@@ -72,15 +116,15 @@ def _build_config(args, prompts_dir: str) -> OEConfig:
         cfg.max_iterations = args.iterations
 
     # Set file suffix / language from example
-    if args.example and args.example in EXAMPLES:
-        ex = EXAMPLES[args.example]
+    if args.example and args.example in _EXAMPLE_BUILDERS:
+        ex = get_example(args.example)
         cfg.file_suffix = ex["file_suffix"]
         cfg.language = ex["language"]
 
-    # Inject ManualLLM via init_client (module-level function, picklable)
+    # Inject ManualLLM via init_client (module-level class instance, picklable)
     manual_model = LLMModelConfig(
         name="manual",
-        init_client=create_manual_llm,
+        init_client=_ManualLLMFactory(prompts_dir),
         weight=1.0,
     )
 
@@ -98,64 +142,184 @@ def _build_config(args, prompts_dir: str) -> OEConfig:
     return cfg
 
 
-def _auto_respond(prompts_dir: str, stop_event: asyncio.Event):
-    """Watch prompts_dir for new prompt files and auto-respond using a simple heuristic improver."""
-    import glob
-    import re
+# Match only prompt_NNN.md (not .response.md files)
+_PROMPT_RE = re.compile(r"prompt_\d+\.md$")
+
+
+# blake2b(prompt body) -> path of a response already written for it. Retries
+# and siblings of the same parent resend byte-identical prompts.
+_RESPONSE_BY_HASH = {}
 
-    responded = set()
-    # Match only prompt_NNN.md (not .response.md files)
-    pattern = re.compile(r"prompt_\d+\.md$")
-    while not stop_event.is_set():
-        prompt_files = sorted(
-            f for f in glob.glob(os.path.join(prompts_dir, "prompt_*.md"))
-            if pattern.search(f)
-        )
-        for pf in prompt_files:
-            if pf in responded:
-                continue
-            resp_path = pf.replace(".md", ".response.md")
-            if os.path.exists(resp_path):
-                responded.add(pf)
-                continue
 
-            # Read the prompt
-            with open(pf) as f:
-                prompt_text = f.read()
+def _prompt_hash(prompt: bytes) -> bytes:
+    return hashlib.blake2b(prompt, digest_size=16).digest()
 
-            # Generate a response: extract parent code and propose improvement
-            response = _generate_improvement(prompt_text)
-            with open(resp_path, "w") as f:
-                f.write(response)
-            responded.add(pf)
-            print(f"  [auto] Responded to {os.path.basename(pf)}")
 
-        time.sleep(1)
+def _response_path(pf: str) -> str:
+    # Only the suffix: a ".md" elsewhere in the directory path must survive
+    return pf[:-len(".md")] + ".response.md"
 
 
-def _generate_improvement(prompt_text: str) -> str:
+def _seed_response_cache(prompts_dir: str):
+    """Index responses left by a previous run so a restart reuses them."""
+    for pf in glob.glob(os.path.join(prompts_dir, "prompt_*.md")):
+        resp_path = _response_path(pf)
+        if not _PROMPT_RE.search(pf) or not os.path.exists(resp_path):
+            continue
+        with open(pf, "rb") as f:
+            _RESPONSE_BY_HASH.setdefault(_prompt_hash(f.read()), resp_path)
+
+
+def _copy_response(src: str, dst: str):
+    """Copy *src* to *dst* in the kernel, published via rename.
+
+    A real copy rather than a hard link, so ManualLLM editing or removing
+    one response can't affect the other. copy_file_range avoids the
+    userspace round-trip (and reflinks on btrfs/xfs); shutil.copyfile
+    covers platforms or filesystems without it.
+    """
+    tmp = dst + ".tmp"
+    try:
+        with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if n == 0:
+                    break
+                remaining -= n
+    except (AttributeError, OSError):  # no copy_file_range, or EXDEV/ENOSYS
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+# A prompt must keep the same size and mtime this long before it is answered
+_SETTLE_S = 0.05
+
+
+def _settled(pf: str) -> bool:
+    """True if *pf* is non-empty and unchanged across two stats _SETTLE_S apart.
+
+    Events fire on the first write, so a prompt may still be growing; it is
+    skipped for now and its next write event (or poll) brings it back.
+    """
+    try:
+        before = os.stat(pf)
+        time.sleep(_SETTLE_S)
+        after = os.stat(pf)
+    except FileNotFoundError:
+        return False
+    return after.st_size > 0 and (
+        (before.st_size, before.st_mtime_ns) == (after.st_size, after.st_mtime_ns)
+    )
+
+
+def _respond(pf: str, responded: set):
+    """Answer one prompt file unless it already has a response."""
+    if pf in responded:
+        return
+    resp_path = _response_path(pf)
+    if os.path.exists(resp_path):
+        responded.add(pf)
+        return
+    if not _settled(pf):
+        return
+
+    # Read the prompt as bytes: hashed as-is, decoded only on a cache miss
+    with open(pf, "rb") as f:
+        prompt = f.read()
+
+    h = _prompt_hash(prompt)
+    cached = _RESPONSE_BY_HASH.get(h)
+    if cached is not None and os.path.exists(cached):
+        # Identical prompt answered before: copy its response
+        _copy_response(cached, resp_path)
+        responded.add(pf)
+        print(f"  [auto] Reused response for {os.path.basename(pf)}")
+        return
+
+    # Generate a response: extract parent code and propose improvement
+    response = _generate_improvement(prompt.decode())
+    # Write-then-rename so ManualLLM never reads a half-written response
+    tmp = resp_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(response)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, resp_path)
+    _RESPONSE_BY_HASH[h] = resp_path
+    responded.add(pf)
+    print(f"  [auto] Responded to {os.path.basename(pf)}")
+
+
+def _auto_respond(prompts_dir: str, stop_event: threading.Event):
+    """Watch prompts_dir for new prompt files and auto-respond using a simple heuristic improver.
+
+    Uses file-system events (watchfiles: inotify/FSEvents) when available,
+    otherwise falls back to polling the directory once per second.
+    """
+    _seed_response_cache(prompts_dir)
+    try:
+        import watchfiles  # noqa: F401
+    except ImportError:
+        return _auto_respond_polling(prompts_dir, stop_event)
+    return _auto_respond_inotify(prompts_dir, stop_event)
+
+
+def _auto_respond_inotify(prompts_dir: str, stop_event: threading.Event):
+    """Event-driven responder: blocks in the kernel until a prompt file changes."""
+    from watchfiles import Change, watch
+
+    responded = set()
+    # Prompts written before the watcher started (e.g. on resume)
+    for pf in sorted(glob.glob(os.path.join(prompts_dir, "prompt_*.md"))):
+        if _PROMPT_RE.search(pf):
+            _respond(pf, responded)
+
+    def _is_prompt(change, path):
+        return change != Change.deleted and _PROMPT_RE.search(path) is not None
+
+    for changes in watch(
+        prompts_dir,
+        watch_filter=_is_prompt,
+        stop_event=stop_event,
+        debounce=50,
+        rust_timeout=1000,  # how often stop_event is checked, in ms
+    ):
+        for pf in sorted({path for _, path in changes}):
+            _respond(pf, responded)
+
+
+def _auto_respond_polling(prompts_dir: str, stop_event: threading.Event):
+    """Fallback responder: rescan prompts_dir every second."""
+    responded = set()
+    prompt_glob = os.path.join(prompts_dir, "prompt_*.md")
+    iglob = glob.iglob
+    while True:
+        for pf in sorted(iglob(prompt_glob)):
+            # The glob also matches prompt_NNN.response.md siblings
+            if ".response." in pf or pf in responded:
+                continue
+            _respond(pf, responded)
+
+        # Returns True immediately once stop_event is set
+        if stop_event.wait(1.0):
+            break
+
+
+def _generate_improvement(prompt_text: str) -> bytes:
     """Generate an improved version of the code from the prompt.
 
-    Produces a diff-style response with a concrete improvement to the search algorithm.
+    Produces a diff-style response with a concrete improvement to the search
+    algorithm, already encoded (the responses are built once at import).
     """
-    import random
-
-    # Choose a random improvement strategy
-    strategies = [
-        _strategy_simulated_annealing,
-        _strategy_adaptive_step,
-        _strategy_multi_restart,
-        _strategy_gradient_estimate,
-    ]
-    strategy = random.choice(strategies)
+    # Round-robin so every strategy is tried before any repeats
+    with _CYCLE_LOCK:
+        strategy = next(_CYCLE)
     return strategy()
 
 
-def _strategy_simulated_annealing() -> str:
-    return '''Here's an improved search algorithm using simulated annealing:
-
-<<<<<<< SEARCH
-    for _ in range(iterations):
+# Loop every strategy replaces (the random search in function_minimization)
+_SEARCH_BLOCK = '''    for _ in range(iterations):
         # Simple random search
         x = np.random.uniform(bounds[0], bounds[1])
         y = np.random.uniform(bounds[0], bounds[1])
@@ -164,59 +328,80 @@ def _strategy_simulated_annealing() -> str:
         if value < best_value:
             best_value = value
             best_x, best_y = x, y
-=======
-    temperature = 2.0
+'''
+
+
+def _batched_response(description: str, inner_name: str, loop: str,
+                      normal_rows: int, uniform_rows: int) -> str:
+    """Wrap a strategy's search loop in an inner function fed pre-drawn randoms.
+
+    *loop* is written against ``f`` (the objective), ``lo``/``hi`` (bounds),
+    ``best_x``/``best_y``/``best_value`` and two pre-drawn arrays:
+    ``normals`` (``normal_rows`` x n, standard normal) and ``uniforms``
+    (``uniform_rows`` x n, in [0, 1)), indexed by iteration. All random
+    numbers come from one ``default_rng`` batch drawn before the loop, so the
+    loop itself is plain scalar arithmetic.
+    """
+    return f"""{description}
+
+<<<<<<< SEARCH
+{_SEARCH_BLOCK}=======
+    def {inner_name}(f, best_x, best_y, best_value, lo, hi, iterations, normals, uniforms):
+{textwrap.indent(loop, "    ")}
+        return best_x, best_y, best_value
+
+    lo, hi = float(bounds[0]), float(bounds[1])
+    # Draw every random number up front; a few spare columns for restart points
+    rng = np.random.default_rng()
+    n = max(iterations, 16)
+    normals = rng.standard_normal(({normal_rows}, n))
+    uniforms = rng.random(({uniform_rows}, n))
+    best_x, best_y, best_value = {inner_name}(
+        evaluate_function, best_x, best_y, best_value, lo, hi, iterations, normals, uniforms
+    )
+>>>>>>> REPLACE
+"""
+
+
+_SA_RESPONSE = _batched_response(
+    "Here's an improved search algorithm using simulated annealing:",
+    "_sa_inner",
+    '''    temperature = 2.0
     cooling_rate = 0.995
     step_size = 1.0
     for i in range(iterations):
         # Simulated annealing with adaptive step size
-        x = best_x + np.random.normal(0, step_size)
-        y = best_y + np.random.normal(0, step_size)
-        x = np.clip(x, bounds[0], bounds[1])
-        y = np.clip(y, bounds[0], bounds[1])
-        value = evaluate_function(x, y)
+        x = min(max(best_x + normals[0, i] * step_size, lo), hi)
+        y = min(max(best_y + normals[1, i] * step_size, lo), hi)
+        value = f(x, y)
 
         delta = value - best_value
-        if delta < 0 or np.random.random() < np.exp(-delta / max(temperature, 1e-10)):
+        if delta < 0 or uniforms[0, i] < np.exp(-delta / max(temperature, 1e-10)):
             best_value = value
             best_x, best_y = x, y
 
         temperature *= cooling_rate
         step_size = max(0.01, step_size * 0.999)
->>>>>>> REPLACE
-'''
+''', normal_rows=2, uniform_rows=1).encode()
 
 
-def _strategy_adaptive_step() -> str:
-    return '''Here's an improved search algorithm with adaptive step sizes and local refinement:
-
-<<<<<<< SEARCH
-    for _ in range(iterations):
-        # Simple random search
-        x = np.random.uniform(bounds[0], bounds[1])
-        y = np.random.uniform(bounds[0], bounds[1])
-        value = evaluate_function(x, y)
-
-        if value < best_value:
-            best_value = value
-            best_x, best_y = x, y
-=======
-    step = (bounds[1] - bounds[0]) / 4.0
+_ADAPTIVE_RESPONSE = _batched_response(
+    "Here's an improved search algorithm with adaptive step sizes and local refinement:",
+    "_adaptive_inner",
+    '''    step = (hi - lo) / 4.0
     no_improve = 0
     for i in range(iterations):
         if no_improve > 50:
             # Random restart
-            best_x = np.random.uniform(bounds[0], bounds[1])
-            best_y = np.random.uniform(bounds[0], bounds[1])
-            best_value = evaluate_function(best_x, best_y)
-            step = (bounds[1] - bounds[0]) / 4.0
+            best_x = lo + (hi - lo) * uniforms[2, i]
+            best_y = lo + (hi - lo) * uniforms[3, i]
+            best_value = f(best_x, best_y)
+            step = (hi - lo) / 4.0
             no_improve = 0
 
-        x = best_x + np.random.uniform(-step, step)
-        y = best_y + np.random.uniform(-step, step)
-        x = np.clip(x, bounds[0], bounds[1])
-        y = np.clip(y, bounds[0], bounds[1])
-        value = evaluate_function(x, y)
+        x = min(max(best_x + step * (2.0 * uniforms[0, i] - 1.0), lo), hi)
+        y = min(max(best_y + step * (2.0 * uniforms[1, i] - 1.0), lo), hi)
+        value = f(x, y)
 
         if value < best_value:
             best_value = value
@@ -226,39 +411,27 @@ def _strategy_adaptive_step() -> str:
             no_improve += 1
             if no_improve % 20 == 0:
                 step *= 0.8
->>>>>>> REPLACE
-'''
-
+''', normal_rows=0, uniform_rows=4).encode()
 
-def _strategy_multi_restart() -> str:
-    return '''Here's an improved search algorithm with multiple restarts and basin hopping:
 
-<<<<<<< SEARCH
-    for _ in range(iterations):
-        # Simple random search
-        x = np.random.uniform(bounds[0], bounds[1])
-        y = np.random.uniform(bounds[0], bounds[1])
-        value = evaluate_function(x, y)
-
-        if value < best_value:
-            best_value = value
-            best_x, best_y = x, y
-=======
-    num_restarts = 5
+_RESTART_RESPONSE = _batched_response(
+    "Here's an improved search algorithm with multiple restarts and basin hopping:",
+    "_restart_inner",
+    '''    num_restarts = 5
     iters_per_restart = iterations // num_restarts
+    k = 0
     for restart in range(num_restarts):
         # Random restart point
-        cx = np.random.uniform(bounds[0], bounds[1])
-        cy = np.random.uniform(bounds[0], bounds[1])
-        cv = evaluate_function(cx, cy)
+        cx = lo + (hi - lo) * uniforms[0, restart]
+        cy = lo + (hi - lo) * uniforms[1, restart]
+        cv = f(cx, cy)
         step = 1.0
 
         for i in range(iters_per_restart):
-            x = cx + np.random.normal(0, step)
-            y = cy + np.random.normal(0, step)
-            x = np.clip(x, bounds[0], bounds[1])
-            y = np.clip(y, bounds[0], bounds[1])
-            value = evaluate_function(x, y)
+            x = min(max(cx + normals[0, k] * step, lo), hi)
+            y = min(max(cy + normals[1, k] * step, lo), hi)
+            k += 1
+            value = f(x, y)
 
             if value < cv:
                 cv = value
@@ -268,49 +441,63 @@ def _strategy_multi_restart() -> str:
         if cv < best_value:
             best_value = cv
             best_x, best_y = cx, cy
->>>>>>> REPLACE
-'''
+''', normal_rows=2, uniform_rows=2).encode()
 
 
-def _strategy_gradient_estimate() -> str:
-    return '''Here's an improved search algorithm using numerical gradient estimation:
-
-<<<<<<< SEARCH
-    for _ in range(iterations):
-        # Simple random search
-        x = np.random.uniform(bounds[0], bounds[1])
-        y = np.random.uniform(bounds[0], bounds[1])
-        value = evaluate_function(x, y)
-
-        if value < best_value:
-            best_value = value
-            best_x, best_y = x, y
-=======
-    lr = 0.1
+_GRADIENT_RESPONSE = _batched_response(
+    "Here's an improved search algorithm using numerical gradient estimation:",
+    "_gradient_inner",
+    '''    lr = 0.1
     eps = 1e-4
     for i in range(iterations):
         # Estimate gradient via finite differences
-        fx = evaluate_function(best_x + eps, best_y)
-        fy = evaluate_function(best_x, best_y + eps)
-        f0 = evaluate_function(best_x, best_y)
+        fx = f(best_x + eps, best_y)
+        fy = f(best_x, best_y + eps)
+        f0 = f(best_x, best_y)
         gx = (fx - f0) / eps
         gy = (fy - f0) / eps
 
         # Gradient descent step with noise for exploration
         noise_scale = max(0.01, 0.5 * (1 - i / iterations))
-        nx = best_x - lr * gx + np.random.normal(0, noise_scale)
-        ny = best_y - lr * gy + np.random.normal(0, noise_scale)
-        nx = np.clip(nx, bounds[0], bounds[1])
-        ny = np.clip(ny, bounds[0], bounds[1])
-        nv = evaluate_function(nx, ny)
+        nx = min(max(best_x - lr * gx + normals[0, i] * noise_scale, lo), hi)
+        ny = min(max(best_y - lr * gy + normals[1, i] * noise_scale, lo), hi)
+        nv = f(nx, ny)
 
         if nv < best_value:
             best_value = nv
             best_x, best_y = nx, ny
 
         lr = max(0.001, lr * 0.999)
->>>>>>> REPLACE
-'''
+''', normal_rows=2, uniform_rows=0).encode()
+
+
+def _strategy_simulated_annealing() -> bytes:
+    return _SA_RESPONSE
+
+
+def _strategy_adaptive_step() -> bytes:
+    return _ADAPTIVE_RESPONSE
+
+
+def _strategy_multi_restart() -> bytes:
+    return _RESTART_RESPONSE
+
+
+def _strategy_gradient_estimate() -> bytes:
+    return _GRADIENT_RESPONSE
+
+
+_STRATEGIES = [
+    _strategy_simulated_annealing,
+    _strategy_adaptive_step,
+    _strategy_multi_restart,
+    _strategy_gradient_estimate,
+]
+_CYCLE = itertools.cycle(_STRATEGIES)
+_CYCLE_LOCK = threading.Lock()
+
+# scores.jsonl entries buffered between flushes
+_SCORES_FLUSH_EVERY = 32
 
 
 async def _run(args):
@@ -333,10 +520,10 @@ async def _run(args):
 
     # Resolve example paths
     if args.example:
-        if args.example not in EXAMPLES:
-            print(f"Unknown example: {args.example}. Available: {list(EXAMPLES.keys())}")
+        if args.example not in _EXAMPLE_BUILDERS:
+            print(f"Unknown example: {args.example}. Available: {list_examples()}")
             return 1
-        ex = EXAMPLES[args.example]
+        ex = get_example(args.example)
         initial_program = ex["initial_program"]
         evaluator = ex["evaluator"]
     else:
@@ -360,17 +547,30 @@ async def _run(args):
         openevolve.database.load(args.resume)
 
     # Start auto-responder if --auto
-    stop_event = asyncio.Event()
-    responder_task = None
+    # Checked from the responder thread, so a threading (not asyncio) Event
+    stop_event = threading.Event()
+    responder_exec = None
     if args.auto:
         print("Auto mode: built-in heuristic strategies will respond to prompts")
+        # One dedicated thread instead of the loop's default (cpu_count+4) pool
+        responder_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auto_responder")
         loop = asyncio.get_event_loop()
-        responder_task = loop.run_in_executor(None, _auto_respond, prompts_dir, stop_event)
+        loop.run_in_executor(responder_exec, _auto_respond, prompts_dir, stop_event)
 
-    # Hook into the database to log scores
+    # Hook into the database to log scores. One buffered handle for the whole
+    # run, flushed every _SCORES_FLUSH_EVERY entries and on exit.
     _original_add = openevolve.database.add
+    scores_fh = open(scores_path, "ab", buffering=1 << 16)
+    pending = 0
+    # Running best, updated per add instead of rescanning the database.
+    # Seeded once so a resumed run starts from the checkpoint's best.
+    best_cache = {"score": float("-inf"), "id": None}
+    seed_best = openevolve.database.get_best_program()
+    if seed_best:
+        best_cache = {"score": seed_best.metrics.get("combined_score", 0), "id": seed_best.id}
 
     def _logging_add(program, *a, **kw):
+        nonlocal best_cache, pending
         result = _original_add(program, *a, **kw)
         score_entry = {
             "timestamp": time.time(),
@@ -379,12 +579,16 @@ async def _run(args):
             "metrics": program.metrics,
             "generation": program.generation,
         }
-        best = openevolve.database.get_best_program()
-        if best:
-            score_entry["best_score"] = best.metrics.get("combined_score", 0)
-            score_entry["best_id"] = best.id
-        with open(scores_path, "a") as f:
-            f.write(json.dumps(score_entry, default=str) + "\n")
+        score = program.metrics.get("combined_score", float("-inf"))
+        if best_cache["id"] is None or score > best_cache["score"]:
+            best_cache = {"score": score, "id": program.id}
+        score_entry["best_score"] = best_cache["score"]
+        score_entry["best_id"] = best_cache["id"]
+        scores_fh.write(_dumps(score_entry) + b"\n")
+        pending += 1
+        if pending >= _SCORES_FLUSH_EVERY:
+            scores_fh.flush()
+            pending = 0
         return result
 
     openevolve.database.add = _logging_add
@@ -406,17 +610,18 @@ async def _run(args):
         else:
             print("\nNo valid programs found.")
     finally:
+        scores_fh.close()
         stop_event.set()
-        if responder_task:
-            # Give responder time to notice the stop event
-            await asyncio.sleep(2)
+        if responder_exec:
+            # Returns as soon as the responder notices the stop event
+            responder_exec.shutdown(wait=True)
 
     return 0
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run OpenEvolve with ManualLLM")
-    parser.add_argument("--example", "-e", choices=list(EXAMPLES.keys()),
+    parser.add_argument("--example", "-e", choices=list_examples(),
                         help="Built-in example to run")
     parser.add_argument("--iterations", "-n", type=int, default=10,
                         help="Number of iterations (default: 10)")
@@ -4,15 +4,41 @@ Reads YAML agent configs from configs/agents/ and returns dicts
 consumable by framework adapters (OpenEvolve, ShinkaEvolve).
 """
 
+import copy
+import functools
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-import yaml
-
 from ..config import Config
 
 
+def scan_yaml_stems(d) -> list:
+    """Sorted stems of the *.yaml files in *d*; [] if it does not exist."""
+    try:
+        with os.scandir(d) as it:
+            return sorted(e.name[:-5] for e in it if e.name.endswith(".yaml") and e.is_file())
+    except FileNotFoundError:
+        return []
+
+
+def load_yaml(f) -> Any:
+    """yaml.load with libyaml's CSafeLoader when available.
+
+    pyyaml is imported on first use, so CLI paths that never parse a
+    config (``run --list``) don't pay for importing it.
+    """
+    import yaml
+    return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_yaml(path_str: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file; *mtime* is only part of the cache key so edits invalidate."""
+    with open(path_str) as f:
+        return load_yaml(f)
+
+
 def load_agent_config(agent_name: str, configs_dir: Optional[str] = None) -> Dict[str, Any]:
     """Load an agent YAML config by name.
 
@@ -29,8 +55,9 @@ def load_agent_config(agent_name: str, configs_dir: Optional[str] = None) -> Dic
     if not path.exists():
         raise FileNotFoundError(f"Agent config not found: {path}")
 
-    with open(path) as f:
-        cfg = yaml.safe_load(f)
+    # Deep copy: neither the api_key written below nor caller edits to nested
+    # sections may leak into the cache
+    cfg = copy.deepcopy(_parse_yaml(str(path), path.stat().st_mtime))
 
     # Resolve API key from environment
     key_env = cfg.get("api_key_env", "")
@@ -38,9 +65,11 @@ def load_agent_config(agent_name: str, configs_dir: Optional[str] = None) -> Dic
     return cfg
 
 
+def clear_config_cache() -> None:
+    """Forget parsed agent configs (edits are already picked up via mtime)."""
+    _parse_yaml.cache_clear()
+
+
 def list_agents(configs_dir: Optional[str] = None) -> list:
     """List available agent config names."""
-    base = Path(configs_dir or Config.EVOLVE_CONFIGS_DIR) / "agents"
-    if not base.exists():
-        return []
-    return sorted(p.stem for p in base.glob("*.yaml"))
+    return scan_yaml_stems(os.path.join(configs_dir or Config.EVOLVE_CONFIGS_DIR, "agents"))
@@ -7,16 +7,15 @@ Usage:
 """
 
 import argparse
+import importlib
 import json
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-import yaml
-
 from ..config import Config
 from .adapters import ADAPTERS
-from .providers import load_agent_config, list_agents
+from .providers import list_agents, load_agent_config, load_yaml, scan_yaml_stems
 
 
 # Registry of available tasks
@@ -24,24 +23,37 @@ TASKS = {
     "llvm_inlining": "mlirAgent.evolve.tasks.llvm_inlining.task.LLVMInliningTask",
 }
 
+# Task classes already imported (or registered directly), by task name
+_TASK_CLASS_CACHE: Dict[str, type] = {}
+
+
+def register_task(name: str):
+    """Class decorator registering a task without a dotted path in TASKS."""
+    def decorator(cls):
+        TASKS[name] = f"{cls.__module__}.{cls.__qualname__}"
+        _TASK_CLASS_CACHE[name] = cls
+        return cls
+    return decorator
+
 
 def _load_task(task_name: str, configs_dir: str) -> Any:
     """Instantiate a task by name, loading its YAML config if present."""
     if task_name not in TASKS:
         raise ValueError(f"Unknown task: {task_name}. Available: {list(TASKS.keys())}")
 
-    # Import task class
-    module_path, class_name = TASKS[task_name].rsplit(".", 1)
-    import importlib
-    mod = importlib.import_module(module_path)
-    task_cls = getattr(mod, class_name)
+    # Import task class (once per process)
+    task_cls = _TASK_CLASS_CACHE.get(task_name)
+    if task_cls is None:
+        module_path, class_name = TASKS[task_name].rsplit(".", 1)
+        task_cls = getattr(importlib.import_module(module_path), class_name)
+        _TASK_CLASS_CACHE[task_name] = task_cls
 
     # Load task YAML config
     task_yaml = Path(configs_dir) / "tasks" / f"{task_name}.yaml"
     task_config = {}
     if task_yaml.exists():
         with open(task_yaml) as f:
-            task_config = yaml.safe_load(f) or {}
+            task_config = load_yaml(f) or {}
 
     return task_cls(task_config)
 
@@ -52,28 +64,20 @@ def _load_framework_config(framework_name: str, configs_dir: str) -> Dict[str, A
     if not fw_yaml.exists():
         raise FileNotFoundError(f"Framework config not found: {fw_yaml}")
     with open(fw_yaml) as f:
-        return yaml.safe_load(f) or {}
+        return load_yaml(f) or {}
 
 
 def _list_available(configs_dir: str):
     """Print available agents, frameworks, and tasks."""
     print("Available configurations:\n")
 
-    print("  Agents:")
-    agents_dir = Path(configs_dir) / "agents"
-    if agents_dir.exists():
-        for p in sorted(agents_dir.glob("*.yaml")):
-            print(f"    - {p.stem}")
-    else:
-        print("    (none)")
-
-    print("\n  Frameworks:")
-    fw_dir = Path(configs_dir) / "frameworks"
-    if fw_dir.exists():
-        for p in sorted(fw_dir.glob("*.yaml")):
-            print(f"    - {p.stem}")
-    else:
-        print("    (none)")
+    for title, sub in (("  Agents:", "agents"), ("\n  Frameworks:", "frameworks")):
+        print(title)
+        stems = scan_yaml_stems(Path(configs_dir) / sub)
+        for stem in stems:
+            print(f"    - {stem}")
+        if not stems:
+            print("    (none)")
 
     print("\n  Tasks:")
     for name in sorted(TASKS.keys()):
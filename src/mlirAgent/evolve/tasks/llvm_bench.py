@@ -5,13 +5,25 @@ CTMark benchmarks: config management, benchmark discovery, compilation
 pipeline (opt -> llc -> gcc), baseline caching, scoring, and Optuna tuning.
 """
 
+import atexit
+import collections
+import errno
+import functools
+import hashlib
 import json
 import os
+import random
 import re
+import select
 import shutil
+import signal
+import statistics
+import struct
 import subprocess
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -19,8 +31,14 @@ try:
     import optuna
 
     _HAS_OPTUNA = True
+    _OPTUNA_HAS_QMC = hasattr(optuna.samplers, "QMCSampler")  # optuna >= 3.0
 except ImportError:
     _HAS_OPTUNA = False
+    _OPTUNA_HAS_QMC = False
+
+# Up to this many trials, quasi-random (Sobol) search covers the space more
+# evenly than TPE, which needs a few dozen trials before its model pays off
+QMC_MAX_TRIALS = 30
 
 
 # ---------------------------------------------------------------------------
@@ -97,6 +115,14 @@ BENCH_RUN_CONFIGS = {
     },
 }
 
+# I/O-bound benchmarks: instruction counts miss their cost, keep wall time
+WALL_TIME_BENCHMARKS = {"sqlite3"}
+
+# Fixed opt/llc flags; evolved flags are appended per call. evolve-worker
+# hardcodes the same pipeline.
+OPT_FLAGS = ("-O2",)
+LLC_FLAGS = ("-O2", "-filetype=obj", "-relocation-model=pic")
+
 # Regex for [hyperparam] annotations in evolved C++ code
 HYPERPARAM_RE = re.compile(
     r"//\s*\[hyperparam\]:\s*([\w-]+),\s*(\w+),\s*(-?\d+),\s*(-?\d+)"
@@ -123,9 +149,18 @@ class EvalConfig:
     baseline_file: str = ""     # Path to baseline cache JSON
     opt_timeout: int = 120      # Per-benchmark timeout for opt/llc (seconds)
     optuna_trials: int = 20     # Optuna trials (0 = disable)
+    optuna_jobs: int = 1        # Concurrent Optuna trials
+    # Optuna tuning benchmarks; None = pick by pilot runtime variance
     optuna_subset: list = field(default_factory=lambda: ["sqlite3", "spass", "tramp3d-v4"])
     ninja: str = ""
     build_targets: str = "bin/opt bin/llc"
+    ninja_jobs: int = 0         # ninja -j (0 = ninja's default)
+    jobs: int = 0               # Parallel benchmark compiles (0 = cpu_count // 2)
+    compile_cache: str = ""     # opt/llc output cache dir ("" = disabled)
+    worker: str = ""            # evolve-worker binary replacing opt|llc ("" = off)
+    result_cache: str = ""      # Per-program result cache dir (default: next to baseline)
+    result_cache_max: int = 500  # Entries kept in result_cache (0 = disabled)
+    quick_check: bool = False   # Smoke-test the heuristic on one benchmark first
 
     def __post_init__(self):
         if not self.testsuite_dir:
@@ -137,6 +172,8 @@ class EvalConfig:
             self.data_dir = str(Path(self.testsuite_dir) / "data")
         if not self.baseline_file:
             self.baseline_file = str(Path(self.testsuite_dir) / "baseline.json")
+        if not self.result_cache:
+            self.result_cache = str(Path(self.baseline_file).parent / "_cache")
         if not self.ninja:
             self.ninja = os.environ.get(
                 "NINJA", shutil.which("ninja") or "ninja"
@@ -153,10 +190,30 @@ class EvalConfig:
             "target_file": os.environ.get("EVOLVE_TARGET_FILE", target_file),
             "opt_timeout": int(os.environ.get("EVOLVE_OPT_TIMEOUT", "120")),
             "optuna_trials": int(os.environ.get("EVOLVE_OPTUNA_TRIALS", "20")),
+            "optuna_jobs": int(os.environ.get("EVOLVE_OPTUNA_JOBS", "1")),
+            "ninja_jobs": int(os.environ.get("EVOLVE_NINJA_JOBS", "0")),
+            "jobs": int(os.environ.get(
+                "EVOLVE_JOBS", os.environ.get("EVOLVE_EVAL_JOBS", "0")
+            )),
+            "compile_cache": os.environ.get("EVOLVE_COMPILE_CACHE", ""),
+            "worker": os.environ.get("EVOLVE_WORKER", ""),
+            "result_cache": os.environ.get("EVOLVE_RESULT_CACHE", ""),
+            "result_cache_max": int(os.environ.get("EVOLVE_CACHE_MAX", "500")),
+            "quick_check": os.environ.get("EVOLVE_QUICK_CHECK", "0") == "1",
         }
+        subset = os.environ.get("EVOLVE_OPTUNA_SUBSET")
+        if subset:
+            defaults["optuna_subset"] = (
+                None if subset == "auto" else subset.split(",")
+            )
         defaults.update(overrides)
         return cls(**defaults)
 
+    @property
+    def subset_cache_file(self) -> str:
+        """Sidecar of *baseline_file* holding auto-picked Optuna subsets."""
+        return str(Path(self.baseline_file).with_suffix(".subset.json"))
+
     @staticmethod
     def add_arguments(parser) -> None:
         """Add EvalConfig flags to an argparse parser."""
@@ -168,6 +225,10 @@ class EvalConfig:
                             help="Per-benchmark timeout in seconds (default: 120)")
         parser.add_argument("--optuna-trials", type=int, default=None,
                             help="Optuna inner-loop trials, 0=disable (default: 20)")
+        parser.add_argument("--jobs", type=int, default=None,
+                            help="Parallel benchmark compiles, 0=auto (env: EVOLVE_JOBS)")
+        parser.add_argument("--cache-dir", default=None,
+                            help="opt/llc output cache (env: EVOLVE_COMPILE_CACHE)")
 
     @classmethod
     def from_args(cls, args, target_file: str, **overrides) -> "EvalConfig":
@@ -190,6 +251,10 @@ class EvalConfig:
             cli["opt_timeout"] = args.opt_timeout
         if getattr(args, "optuna_trials", None) is not None:
             cli["optuna_trials"] = args.optuna_trials
+        if getattr(args, "jobs", None) is not None:
+            cli["jobs"] = args.jobs
+        if getattr(args, "cache_dir", None):
+            cli["compile_cache"] = args.cache_dir
         cli.update(overrides)
         return cls.from_env(target_file, **cli)
 
@@ -198,94 +263,645 @@ class EvalConfig:
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Smallest free space for /dev/shm to be used as default scratch
+_SHM_MIN_FREE = 1 << 30
+
+
+@functools.lru_cache(maxsize=1)
+def scratch_dir():
+    """Parent dir for per-evaluation temp dirs (objects, binaries, run dirs).
+
+    ``EVOLVE_SCRATCH_DIR`` if set; otherwise the first of ``/dev/shm`` and
+    ``$XDG_RUNTIME_DIR`` (both tmpfs) that is writable, allows exec
+    (benchmarks run from here) and has at least 1 GiB free; otherwise None,
+    i.e. the system temp dir.
+    """
+    env = os.environ.get("EVOLVE_SCRATCH_DIR")
+    if env:
+        os.makedirs(env, exist_ok=True)
+        return env
+    for shm in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR")):
+        if not shm:
+            continue
+        try:
+            st = os.statvfs(shm)
+        except OSError:
+            continue
+        if (st.f_flag & (os.ST_NOEXEC | os.ST_RDONLY)
+                or st.f_bavail * st.f_frsize < _SHM_MIN_FREE
+                or not os.access(shm, os.W_OK)):
+            continue
+        return shm
+    return None
+
+
 def extract_hyperparams(code: str):
     """Parse ``// [hyperparam]: name, type, min, max`` comments from C++ source.
 
     Returns list of ``(flag_name, type_str, min_val, max_val)`` tuples.
     """
+    if "[hyperparam]" not in code:
+        return []
     return [
-        (m.group(1), m.group(2), int(m.group(3)), int(m.group(4)))
-        for m in HYPERPARAM_RE.finditer(code)
+        (name, type_str, int(lo), int(hi))
+        for name, type_str, lo, hi in HYPERPARAM_RE.findall(code)
     ]
 
 
+@functools.lru_cache(maxsize=8)
+def _scan_benchmarks(testsuite_dir: str, mtime_ns: int):
+    return tuple(sorted(
+        bc for bc in Path(testsuite_dir).glob("*.bc")
+        if bc.stem not in EXCLUDED
+    ))
+
+
 def find_benchmarks(testsuite_dir: Path):
-    """Find CTMark .bc files in *testsuite_dir*, excluding problematic ones."""
-    if not testsuite_dir.exists():
+    """Find CTMark .bc files in *testsuite_dir*, excluding problematic ones.
+
+    The scan is cached on the directory's mtime, so adding or removing a
+    .bc file is picked up on the next call.
+    """
+    try:
+        mtime_ns = testsuite_dir.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
-    return sorted(
-        bc for bc in testsuite_dir.glob("*.bc")
-        if bc.stem not in EXCLUDED
-    )
+    return list(_scan_benchmarks(str(testsuite_dir), mtime_ns))
+
+
+# ELF section header flags (see elf(5))
+_SHF_WRITE = 0x1
+_SHF_ALLOC = 0x2
+_SHF_EXECINSTR = 0x4
+
+
+def _elf_text_size(obj_path: str):
+    """Berkeley ``text`` size of an ELF object, parsed in-process.
+
+    Same rule as binutils ``size``: every allocated section that is
+    executable or read-only. Only the ELF header and the section header
+    table are read. Returns None if *obj_path* is not ELF.
+    """
+    with open(obj_path, "rb") as f:
+        ehdr = f.read(64)
+        if ehdr[:4] != b"\x7fELF":
+            return None
+        end = "<" if ehdr[5] == 1 else ">"
+        if ehdr[4] == 2:
+            shoff, = struct.unpack_from(end + "Q", ehdr, 0x28)
+            shentsize, shnum = struct.unpack_from(end + "HH", ehdr, 0x3A)
+            hdr = end + "IIQQQQ"   # name, type, flags, addr, offset, size
+        else:
+            shoff, = struct.unpack_from(end + "I", ehdr, 0x20)
+            shentsize, shnum = struct.unpack_from(end + "HH", ehdr, 0x2E)
+            hdr = end + "IIIIII"
+        if shoff == 0:
+            return 0
+        f.seek(shoff)
+        if shnum == 0:
+            # >= 0xff00 sections (COMDAT-heavy C++): count is in shdr[0].sh_size
+            shnum = struct.unpack_from(hdr, f.read(shentsize))[5]
+            f.seek(shoff)
+        shdrs = f.read(shentsize * shnum)
+    total = 0
+    for i in range(shnum):
+        _, _, flags, _, _, size = struct.unpack_from(hdr, shdrs, i * shentsize)
+        if flags & _SHF_ALLOC and (flags & _SHF_EXECINSTR or not flags & _SHF_WRITE):
+            total += size
+    return total
 
 
 def get_text_size(obj_path: str) -> int:
-    """Get .text section size from an object file using ``size(1)``."""
+    """Get the text size (as reported by ``size(1)``) of an ELF object file.
+
+    Falls back to the file size if *obj_path* is missing or not ELF.
+    """
     try:
+        text_size = _elf_text_size(obj_path)
+        if text_size is not None:
+            return text_size
+    except (OSError, struct.error):
+        pass
+    return os.path.getsize(obj_path) if os.path.exists(obj_path) else 0
+
+
+@functools.lru_cache(maxsize=8)
+def _build_identity(tool_path, size, mtime_ns):
+    """Identity of the LLVM build *tool_path* belongs to, short of its mtime.
+
+    Covers the tool's path and size, its ``--version`` (LLVM version and,
+    with LLVM_APPEND_VC_REV, the commit) and the build's CMakeCache.txt
+    (compiler and flags). *mtime_ns* only re-probes after a relink.
+    """
+    h = hashlib.sha256(f"{os.path.abspath(tool_path)}\0{size}".encode())
+    try:
+        h.update(subprocess.run([tool_path, "--version"], capture_output=True,
+                                timeout=30).stdout)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    try:
+        h.update(Path(tool_path).resolve().parent.parent.joinpath(
+            "CMakeCache.txt").read_bytes())
+    except OSError:
+        pass
+    return h.hexdigest()
+
+
+def _cache_key(tool_path, input_path, flags, default_path=False):
+    """Content key for one opt/llc invocation: input bytes, flags, tool mtime.
+
+    The tool's mtime changes whenever an evolved candidate is rebuilt, so
+    entries never outlive the binary that produced them. With
+    *default_path* (no evolved flags), :func:`_build_identity` stands in
+    for the mtime: entries survive relinks that leave the tool's size,
+    version and configuration alone, which, like the baseline (see
+    :func:`benchmark_key`), assumes candidates only change evolved code paths.
+    """
+    h = hashlib.sha256()
+    with open(input_path, "rb") as f:
+        h.update(f.read())
+    h.update("\0".join(flags).encode())
+    st = os.stat(tool_path)
+    if default_path:
+        h.update(_build_identity(tool_path, st.st_size, st.st_mtime_ns).encode())
+    else:
+        h.update(str(st.st_mtime_ns).encode())
+    return h.hexdigest()
+
+
+def _cache_fetch(cache_dir, key, dst):
+    """Materialize cached output *key* at *dst*; return False on a miss."""
+    src = os.path.join(cache_dir, key)
+    try:
+        os.link(src, dst)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # Cross-device or no hardlink support
+        try:
+            shutil.copyfile(src, dst)
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _cache_store(cache_dir, key, src):
+    """Publish *src* under *key*; atomic, so concurrent readers see all or nothing."""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = os.path.join(cache_dir, f"{key}.{os.getpid()}.{os.path.basename(src)}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, os.path.join(cache_dir, key))
+    except OSError:
+        pass
+
+
+def _run_logged(cmd, timeout, limit=500, tail=False, env=None):
+    """Run *cmd* with stdout+stderr spooled to a temp file, not to memory.
+
+    Returns ``(returncode, output)`` where *output* is the first (or with
+    *tail*, last) *limit* bytes, decoded, and empty on success. A crashing
+    heuristic can make opt print megabytes; this keeps parallel compiles
+    from holding all of it. Raises TimeoutExpired.
+    """
+    with tempfile.TemporaryFile(dir=scratch_dir()) as log:
         proc = subprocess.run(
-            ["size", str(obj_path)],
-            capture_output=True, text=True, timeout=10,
+            cmd, stdout=log, stderr=subprocess.STDOUT, timeout=timeout, env=env,
         )
         if proc.returncode == 0:
-            lines = proc.stdout.strip().split("\n")
-            if len(lines) >= 2:
-                return int(lines[1].split()[0])
-    except (subprocess.TimeoutExpired, ValueError, IndexError):
-        pass
-    return os.path.getsize(obj_path) if os.path.exists(obj_path) else 0
+            return 0, ""
+        size = log.seek(0, os.SEEK_END)
+        log.seek(max(0, size - limit) if tail else 0)
+        return proc.returncode, log.read(limit).decode(errors="replace")
+
+
+def _run_tool(cmd, tool_path, input_path, flags, output, timeout, cache_dir=None,
+              default_path=False):
+    """Run an opt/llc *cmd* producing *output*, served from *cache_dir* if possible.
+
+    *default_path* is passed to :func:`_cache_key`. Returns an error string,
+    or None on success. Raises TimeoutExpired.
+    """
+    key = None
+    if cache_dir:
+        key = _cache_key(tool_path, input_path, flags, default_path)
+        # A stale *output* may be a hardlink into the cache; never write through it
+        try:
+            os.unlink(output)
+        except FileNotFoundError:
+            pass
+        if _cache_fetch(cache_dir, key, output):
+            return None
+    rc, log = _run_logged(cmd, timeout)
+    if rc != 0:
+        return log
+    if key:
+        _cache_store(cache_dir, key, output)
+    return None
+
+
+# How opt exits when llc closes the pipe early: killed by SIGPIPE, or
+# LLVM's pipe signal handler exiting with EX_IOERR
+_BROKEN_PIPE_RCS = (-signal.SIGPIPE, 74)
+
+
+def _pipe_opt_llc(opt_cmd, llc_cmd, timeout):
+    """Run ``opt_cmd | llc_cmd`` with *timeout* seconds for the whole pipeline.
+
+    Returns an error string, or None on success. When both fail, the stage
+    that failed first is reported: llc's diagnostic if opt only died of the
+    broken pipe, opt's otherwise (llc then just saw truncated input).
+    """
+    deadline = time.monotonic() + timeout
+    with tempfile.TemporaryFile(dir=scratch_dir()) as opt_err, \
+            tempfile.TemporaryFile(dir=scratch_dir()) as llc_err:
+        opt = subprocess.Popen(opt_cmd, stdout=subprocess.PIPE, stderr=opt_err)
+        try:
+            llc = subprocess.Popen(
+                llc_cmd, stdin=opt.stdout, stdout=subprocess.DEVNULL, stderr=llc_err,
+            )
+        except OSError:
+            opt.kill()
+            opt.wait()
+            raise
+        finally:
+            opt.stdout.close()  # llc holds the only read end now
+
+        # opt finishes first; llc gets whatever is left of the deadline
+        for tool, proc in (("opt", opt), ("llc", llc)):
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                for p in (opt, llc):
+                    p.kill()
+                    p.wait()
+                return f"{tool} timed out ({timeout}s)"
+
+        if llc.returncode != 0 and opt.returncode in (0,) + _BROKEN_PIPE_RCS:
+            err_fh = llc_err
+        elif opt.returncode != 0:
+            err_fh = opt_err
+        else:
+            return None
+        err_fh.seek(0)
+        return err_fh.read(500).decode(errors="replace")
+
+
+@functools.lru_cache(maxsize=1)
+def _fuse_ld_flags():
+    """``-fuse-ld=lld`` if gcc can link with lld here, else nothing.
+
+    lld starts and links noticeably faster than GNU ld; probed once per
+    process. Set ``EVOLVE_LINKER=bfd`` to keep the system linker.
+    """
+    linker = os.environ.get("EVOLVE_LINKER", "lld")
+    if linker == "bfd" or shutil.which(f"ld.{linker}") is None:
+        return []
+    return [f"-fuse-ld={linker}"]
+
+
+def link_flags(name: str):
+    """gcc flags for linking benchmark *name* (linker choice + libraries)."""
+    return _fuse_ld_flags() + ["-lm", "-lpthread", "-ldl"] + EXTRA_LINK_FLAGS.get(name, [])
+
+
+def _readline(stream, timeout):
+    """Read one line from *stream*; None if nothing arrives within *timeout*."""
+    ready, _, _ = select.select([stream], [], [], timeout)
+    return stream.readline() if ready else None
+
+
+def _stop(proc):
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+class _WorkerPool:
+    """Idle ``evolve-worker`` processes for one (binary, flags) combination.
+
+    Workers parse their cl::opt flags once at startup, so a worker only
+    serves requests with the flags it was started with. Only the most
+    recent combination is kept: Optuna changes flags every trial, and the
+    benchmarks of one trial all share them. Workers are also replaced when
+    the binary is relinked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._idle = []
+
+    def compile(self, worker, flags, bc_path, obj_file, timeout):
+        """Compile *bc_path* to *obj_file*; return an error string or None."""
+        try:
+            key = (worker, os.stat(worker).st_mtime_ns, tuple(flags))
+        except OSError as e:
+            return f"worker unavailable: {e}"
+        stale = []
+        with self._lock:
+            if key != self._key:
+                stale, self._idle, self._key = self._idle, [], key
+            proc = self._idle.pop() if self._idle else None
+        for p in stale:
+            _stop(p)
+        if proc is None:
+            try:
+                proc = subprocess.Popen(
+                    [worker] + list(flags), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                )
+            except OSError as e:
+                return f"worker failed to start: {e}"
+
+        try:
+            proc.stdin.write(f"{bc_path}\t{obj_file}\n".encode())
+            proc.stdin.flush()
+            line = _readline(proc.stdout, timeout)
+        except OSError:
+            line = b""
+        if line is None:
+            _stop(proc)
+            return f"worker timed out ({timeout}s)"
+        if not line:
+            # The evolved code crashed the worker (as it would crash opt)
+            _stop(proc)
+            return f"worker exited with {proc.returncode}"
+
+        with self._lock:
+            if key == self._key:
+                self._idle.append(proc)
+                proc = None
+        if proc is not None:
+            _stop(proc)
+        if line.startswith(b"ok"):
+            return None
+        return line.decode(errors="replace").partition(" ")[2].strip()[:500]
+
+    def close(self):
+        with self._lock:
+            idle, self._idle, self._key = self._idle, [], None
+        for proc in idle:
+            proc.stdin.close()
+            proc.wait()
+
+
+_WORKERS = _WorkerPool()
+atexit.register(_WORKERS.close)
 
 
 # ---------------------------------------------------------------------------
 # Benchmark execution
 # ---------------------------------------------------------------------------
 
-def run_benchmark(name: str, binary_path: str, tmp_dir: str, data_dir: str):
-    """Run a benchmark with reference inputs; return wall-clock seconds or None."""
+def _fastcopy(src: str, dst: str):
+    """Copy file data and mode bits with ``copy_file_range`` (in-kernel, and a
+    reflink on filesystems that support it); plain copy where unavailable.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(src, dst)
+        shutil.copymode(src, dst)
+        return
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        st = os.fstat(fsrc.fileno())
+        remaining = st.st_size
+        try:
+            while remaining > 0:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if n == 0:
+                    break
+                remaining -= n
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+            remaining = st.st_size
+        if remaining:
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+        os.fchmod(fdst.fileno(), st.st_mode & 0o7777)
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink *src* to *dst* (replacing it), copying across filesystems."""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        _fastcopy(src, dst)
+
+
+def _link_tree(src: Path, dst: str):
+    """Mirror the contents of *src* into *dst* with hardlinks.
+
+    Reference inputs are only read by the benchmarks, so sharing inodes is
+    safe and costs one link() per file instead of a data copy. Falls back
+    to a reflink/regular copy when *dst* is on another filesystem.
+    """
+    try:
+        for root, dirs, files in os.walk(src):
+            out = os.path.join(dst, os.path.relpath(root, src))
+            for d in dirs:
+                os.makedirs(os.path.join(out, d), exist_ok=True)
+            for f in files:
+                target = os.path.join(out, f)
+                if not os.path.exists(target):
+                    os.link(os.path.join(root, f), target)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        proc = subprocess.run(
+            ["cp", "-r", "--reflink=auto", f"{src}/.", dst],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        if proc.returncode != 0:
+            shutil.copytree(str(src), dst, dirs_exist_ok=True)
+
+
+def warm_data(data_dir: str, benchmarks):
+    """Ask the kernel to pull each benchmark's reference data into page cache.
+
+    Called once before a batch of runs, so the first timed runs don't pay
+    cold-cache reads. Uses POSIX_FADV_WILLNEED (read-ahead, returns
+    immediately); a no-op where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for bc in benchmarks:
+        for root, _, files in os.walk(Path(data_dir) / bc.stem):
+            for f in files:
+                try:
+                    fd = os.open(os.path.join(root, f), os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
+def bench_cpus():
+    """CPUs benchmark runs are pinned to (``EVOLVE_BENCH_CPU``, e.g. ``3`` or
+    ``2,3``), or None to leave affinity alone.
+
+    Point it at cores isolated from the compile threads (``isolcpus=`` or a
+    cpuset) to cut wall-clock variance. CPUs this process may not use are
+    dropped.
+    """
+    spec = os.environ.get("EVOLVE_BENCH_CPU", "")
+    try:
+        cpus = {int(c) for c in spec.split(",") if c.strip()}
+        cpus &= os.sched_getaffinity(0)
+    except (ValueError, AttributeError):
+        return None
+    return frozenset(cpus) or None
+
+
+@functools.lru_cache(maxsize=1)
+def _pin_prefix():
+    """``taskset -c <cpus>`` for :func:`bench_cpus`, or [] to run unpinned.
+
+    A command prefix rather than ``preexec_fn``: the latter is unsafe with the
+    worker threads around us and forces fork+exec instead of vfork.
+    """
+    cpus = bench_cpus()
+    taskset = shutil.which("taskset")
+    if not cpus:
+        return []
+    if taskset is None:
+        print("  Warning: EVOLVE_BENCH_CPU is set but taskset was not found; "
+              "benchmarks run unpinned")
+        return []
+    return [taskset, "-c", ",".join(map(str, sorted(cpus)))]
+
+
+def _time_run(cmd, run_dir, stdin_fh, timeout):
+    """Run *cmd* once; return wall-clock seconds, or None on failure/timeout."""
+    if stdin_fh is not None:
+        stdin_fh.seek(0)
+    else:
+        stdin_fh = subprocess.DEVNULL  # never read the harness's own stdin
+    start = time.perf_counter_ns()
+    proc = subprocess.run(
+        _pin_prefix() + cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        timeout=timeout, cwd=run_dir, stdin=stdin_fh,
+    )
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    return elapsed if proc.returncode == 0 else None
+
+
+def _parse_perf_instructions(path):
+    """Read the ``instructions:u`` count from ``perf stat -x,`` output."""
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split(",")
+                if len(fields) > 2 and fields[2].startswith("instructions"):
+                    return int(fields[0])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _count_run(cmd, run_dir, stdin_fh, timeout):
+    """Run *cmd* once under ``perf stat``; return user-space instructions."""
+    out = os.path.join(run_dir, ".perf_stat")
+    perf_cmd = ["perf", "stat", "-x", ",", "-e", "instructions:u", "-o", out, "--"]
+    if _time_run(perf_cmd + cmd, run_dir, stdin_fh, timeout) is None:
+        return None
+    return _parse_perf_instructions(out)
+
+
+@functools.lru_cache(maxsize=1)
+def runtime_metric() -> str:
+    """``"instructions"`` if ``perf stat`` can count them here, else ``"seconds"``.
+
+    ``EVOLVE_RUNTIME_METRIC`` forces either, or ``"none"`` to skip running
+    benchmarks at all (size-only screening; ``EVOLVE_DISABLE_PERF=1`` is an
+    alias). Probed once per process by counting ``true``, which also covers
+    perf_event_paranoid and virtualized hosts without PMU access.
+    """
+    forced = os.environ.get("EVOLVE_RUNTIME_METRIC")
+    if os.environ.get("EVOLVE_DISABLE_PERF") == "1":
+        forced = "none"
+    if forced in ("seconds", "instructions", "none"):
+        return forced
+    if shutil.which("perf") is None:
+        return "seconds"
+    with tempfile.TemporaryDirectory(prefix="evolve_perf_", dir=scratch_dir()) as d:
+        try:
+            count = _count_run([shutil.which("true") or "/bin/true"], d, None, 10)
+        except (OSError, subprocess.TimeoutExpired):
+            count = None
+    return "instructions" if count else "seconds"
+
+
+def run_benchmark(name: str, binary_path: str, tmp_dir: str, data_dir: str,
+                  num_runs: int = 3):
+    """Run a benchmark with reference inputs; return its cost or None.
+
+    The cost is in :func:`runtime_metric` units. With ``"instructions"``
+    it is the user-space instruction count of a single run (deterministic,
+    so no repeats). Otherwise, and always for ``WALL_TIME_BENCHMARKS``, it
+    is wall-clock seconds: one untimed warmup run (page cache, dynamic
+    loader) is followed by *num_runs* timed runs and the median is
+    returned. Long benchmarks (timeout >= 60s) are timed once with no
+    warmup to bound baseline cost.
+    """
     config = BENCH_RUN_CONFIGS.get(name)
-    if not config:
+    if not config or runtime_metric() == "none":
         return None
 
     run_dir = os.path.join(tmp_dir, f"{name}_run")
     os.makedirs(run_dir, exist_ok=True)
     run_binary = os.path.join(run_dir, name)
-    shutil.copy2(binary_path, run_binary)
+    _link_or_copy(binary_path, run_binary)
     os.chmod(run_binary, 0o755)
 
     bench_data = Path(data_dir) / name
 
     # Copy data files/dirs
     if config.get("data_subdir") and bench_data.exists():
-        for item in bench_data.iterdir():
-            dst = os.path.join(run_dir, item.name)
-            if item.is_dir():
-                shutil.copytree(str(item), dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(str(item), dst)
+        _link_tree(bench_data, run_dir)
     elif config.get("data_files") and bench_data.exists():
         for f in config["data_files"]:
             src = bench_data / f
             if src.exists():
-                shutil.copy2(str(src), os.path.join(run_dir, f))
+                _link_or_copy(str(src), os.path.join(run_dir, f))
 
-    # Prepare stdin
+    # Prepare stdin (rewound before every run)
     stdin_fh = None
     if config.get("stdin_file") and bench_data.exists():
         stdin_src = bench_data / config["stdin_file"]
         if stdin_src.exists():
-            stdin_fh = open(str(stdin_src), "r")
+            stdin_fh = open(str(stdin_src), "rb")
 
     cmd = [run_binary] + config.get("args", [])
     timeout = config.get("timeout", 30)
+    warmup = timeout < 60
+    if not warmup:
+        num_runs = 1
 
     try:
-        start = time.time()
-        proc = subprocess.run(
-            cmd, capture_output=True, timeout=timeout,
-            cwd=run_dir, stdin=stdin_fh,
-        )
-        elapsed = time.time() - start
-        if proc.returncode == 0:
-            return elapsed
+        if runtime_metric() == "instructions" and name not in WALL_TIME_BENCHMARKS:
+            return _count_run(cmd, run_dir, stdin_fh, timeout)
+        if warmup and _time_run(cmd, run_dir, stdin_fh, timeout) is None:
+            return None
+        times = []
+        for _ in range(max(1, num_runs)):
+            elapsed = _time_run(cmd, run_dir, stdin_fh, timeout)
+            if elapsed is None:
+                return None
+            times.append(elapsed)
+        return statistics.median(times)
     except subprocess.TimeoutExpired:
         pass
     finally:
@@ -296,7 +912,8 @@ def run_benchmark(name: str, binary_path: str, tmp_dir: str, data_dir: str):
 
 def compile_benchmark(bc_path, opt_path, llc_path, tmp_dir, data_dir,
                       evolved_opt_flags=None, evolved_llc_flags=None,
-                      opt_timeout=120):
+                      opt_timeout=120, measure_runtime=True, cache_dir=None,
+                      worker=None):
     """Compile a .bc file through ``opt -> llc -> gcc``.
 
     Callers pass evolved flags to *opt*, *llc*, or both:
@@ -304,6 +921,12 @@ def compile_benchmark(bc_path, opt_path, llc_path, tmp_dir, data_dir,
     - Inlining: ``evolved_opt_flags=["-use-evolved-inline-cost", ...]``
     - RegAlloc: ``evolved_llc_flags=["-use-evolved-regalloc-priority", ...]``
 
+    With ``measure_runtime=False`` the linked binary is left in *tmp_dir*
+    and not run (runtime is None). With *cache_dir*, opt and llc outputs
+    are looked up by content before forking either tool. Otherwise, with
+    *worker* (an ``evolve-worker`` binary), opt and llc run in a pooled
+    worker process instead of two fresh processes.
+
     Returns ``(text_size, binary_size, runtime, error)`` 4-tuple.
     """
     name = bc_path.stem
@@ -311,142 +934,608 @@ def compile_benchmark(bc_path, opt_path, llc_path, tmp_dir, data_dir,
     obj_file = os.path.join(tmp_dir, f"{name}.o")
     binary = os.path.join(tmp_dir, name)
 
-    # opt pass
-    opt_cmd = [str(opt_path), "-O2"]
-    if evolved_opt_flags:
-        opt_cmd.extend(evolved_opt_flags)
-    opt_cmd += [str(bc_path), "-o", opt_bc]
+    opt_flags = [*OPT_FLAGS, *(evolved_opt_flags or ())]
+    llc_flags = [*LLC_FLAGS, *(evolved_llc_flags or ())]
 
-    try:
-        proc = subprocess.run(
-            opt_cmd, capture_output=True, text=True, timeout=opt_timeout,
+    if cache_dir is None and worker:
+        err = _WORKERS.compile(
+            worker, list(evolved_opt_flags or []) + list(evolved_llc_flags or []),
+            bc_path, obj_file, opt_timeout,
         )
-    except subprocess.TimeoutExpired:
-        return None, None, None, f"opt timed out ({opt_timeout}s)"
-    if proc.returncode != 0:
-        return None, None, None, proc.stderr[:500]
-
-    # llc: bitcode -> object
-    llc_cmd = [str(llc_path), "-O2", "-filetype=obj", "-relocation-model=pic"]
-    if evolved_llc_flags:
-        llc_cmd.extend(evolved_llc_flags)
-    llc_cmd += [opt_bc, "-o", obj_file]
-
-    try:
-        proc = subprocess.run(
-            llc_cmd, capture_output=True, text=True, timeout=opt_timeout,
+        if err is not None:
+            return None, None, None, err
+    elif cache_dir is None:
+        # opt | llc: the optimized bitcode never touches the disk
+        err = _pipe_opt_llc(
+            [str(opt_path)] + opt_flags + [str(bc_path), "-o", "-"],
+            [str(llc_path)] + llc_flags + ["-", "-o", obj_file],
+            opt_timeout,
         )
-    except subprocess.TimeoutExpired:
-        return None, None, None, f"llc timed out ({opt_timeout}s)"
-    if proc.returncode != 0:
-        return None, None, None, proc.stderr[:500]
+        if err is not None:
+            return None, None, None, err
+    else:
+        # Separate steps so each tool's output can be cached on its own
+        opt_cmd = [str(opt_path)] + opt_flags + [str(bc_path), "-o", opt_bc]
+        try:
+            err = _run_tool(opt_cmd, opt_path, bc_path, opt_flags, opt_bc,
+                            opt_timeout, cache_dir,
+                            default_path=not evolved_opt_flags)
+        except subprocess.TimeoutExpired:
+            return None, None, None, f"opt timed out ({opt_timeout}s)"
+        if err is not None:
+            return None, None, None, err
+
+        # llc: bitcode -> object
+        llc_cmd = [str(llc_path)] + llc_flags + [opt_bc, "-o", obj_file]
+        try:
+            err = _run_tool(llc_cmd, llc_path, opt_bc, llc_flags, obj_file,
+                            opt_timeout, cache_dir,
+                            default_path=not evolved_llc_flags)
+        except subprocess.TimeoutExpired:
+            return None, None, None, f"llc timed out ({opt_timeout}s)"
+        finally:
+            # The cache keeps its own link/copy; drop the scratch bitcode
+            try:
+                os.unlink(opt_bc)
+            except FileNotFoundError:
+                pass
+        if err is not None:
+            return None, None, None, err
 
     text_size = get_text_size(obj_file)
 
+    # Byte-identical object as an earlier candidate: same binary, same run
+    obj_key = _obj_key(obj_file, name, data_dir)
+    hit = _recall_run(obj_key)
+    if hit is not None:
+        binary_size, runtime = hit
+        return text_size, binary_size, runtime, None
+
     # Link to binary with per-benchmark flags
-    extra_flags = EXTRA_LINK_FLAGS.get(name, [])
-    gcc_cmd = ["gcc", obj_file, "-o", binary, "-lm", "-lpthread", "-ldl"] + extra_flags
+    gcc_cmd = ["gcc", obj_file, "-o", binary] + link_flags(name)
     try:
-        proc = subprocess.run(
-            gcc_cmd, capture_output=True, text=True, timeout=60,
-        )
+        rc, log = _run_logged(gcc_cmd, 60, limit=200)
     except subprocess.TimeoutExpired:
         return text_size, None, None, "link timed out"
-    if proc.returncode != 0:
-        return text_size, None, None, f"link failed: {proc.stderr[:200]}"
+    if rc != 0:
+        return text_size, None, None, f"link failed: {log}"
 
     binary_size = os.path.getsize(binary)
+    if not measure_runtime:
+        return text_size, binary_size, None, None
     runtime = run_benchmark(name, binary, tmp_dir, data_dir)
+    _remember_run(obj_key, name, binary_size, runtime)
     return text_size, binary_size, runtime, None
 
 
+# (binary_size, runtime) per linked-and-run object, see _obj_key; least
+# recently used entries are dropped past _OBJ_RESULT_CACHE_MAX. A long evolve
+# run sees many objects but only recent candidates tend to be re-proposed.
+_OBJ_RESULT_CACHE = collections.OrderedDict()
+_OBJ_RESULT_CACHE_MAX = 1024
+_OBJ_RESULT_LOCK = threading.Lock()
+
+
+def _obj_key(obj_file, name, data_dir):
+    """Key for an object's link+run result: object bytes, link flags, inputs."""
+    h = hashlib.sha256()
+    with open(obj_file, "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps([name, link_flags(name), str(data_dir)]).encode())
+    return h.hexdigest()
+
+
+def _recall_run(obj_key):
+    with _OBJ_RESULT_LOCK:
+        hit = _OBJ_RESULT_CACHE.get(obj_key)
+        if hit is not None:
+            _OBJ_RESULT_CACHE.move_to_end(obj_key)
+        return hit
+
+
+def _remember_run(obj_key, name, binary_size, runtime):
+    # A configured benchmark that failed to run may have hit a transient
+    # timeout; only keep results worth reusing.
+    if runtime is None and name in BENCH_RUN_CONFIGS:
+        return
+    with _OBJ_RESULT_LOCK:
+        _OBJ_RESULT_CACHE[obj_key] = (binary_size, runtime)
+        _OBJ_RESULT_CACHE.move_to_end(obj_key)
+        while len(_OBJ_RESULT_CACHE) > _OBJ_RESULT_CACHE_MAX:
+            _OBJ_RESULT_CACHE.popitem(last=False)
+
+
+def _resolve_jobs(jobs):
+    return jobs if jobs and jobs > 0 else max(1, (os.cpu_count() or 2) // 2)
+
+
+def compile_benchmarks(benchmarks, opt_path, llc_path, tmp_dir, data_dir,
+                       evolved_opt_flags=None, evolved_llc_flags=None,
+                       opt_timeout=120, jobs=0, cache_dir=None, on_result=None,
+                       worker=None):
+    """Run :func:`compile_benchmark` over *benchmarks*, *jobs* at a time.
+
+    Compiles are independent subprocess pipelines, so they run on a thread
+    pool, each in its own ``tmp_dir/<name>`` subdirectory. Runtimes are then
+    measured serially, since concurrent load would skew the timings.
+
+    Returns a list of ``(text_size, binary_size, runtime, error)`` in
+    *benchmarks* order. *on_result(bc, result)*, if given, is called as
+    each benchmark's result becomes final.
+    """
+    jobs = _resolve_jobs(jobs)
+    kwargs = dict(evolved_opt_flags=evolved_opt_flags,
+                  evolved_llc_flags=evolved_llc_flags, opt_timeout=opt_timeout,
+                  cache_dir=cache_dir, worker=worker)
+    results = []
+    if jobs == 1:
+        for bc in benchmarks:
+            result = compile_benchmark(bc, opt_path, llc_path, tmp_dir, data_dir, **kwargs)
+            if on_result is not None:
+                on_result(bc, result)
+            results.append(result)
+        return results
+
+    def _compile(bc):
+        bench_dir = os.path.join(tmp_dir, bc.stem)
+        os.makedirs(bench_dir, exist_ok=True)
+        return compile_benchmark(bc, opt_path, llc_path, bench_dir, data_dir,
+                                 measure_runtime=False, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(benchmarks) or 1)) as pool:
+        compiled = list(pool.map(_compile, benchmarks))
+
+    for bc, (text_size, binary_size, runtime, err) in zip(benchmarks, compiled):
+        # runtime is already set when the object matched an earlier run
+        if binary_size is not None and runtime is None:
+            bench_dir = os.path.join(tmp_dir, bc.stem)
+            runtime = run_benchmark(bc.stem, os.path.join(bench_dir, bc.stem),
+                                    bench_dir, data_dir)
+            _remember_run(
+                _obj_key(os.path.join(bench_dir, f"{bc.stem}.o"), bc.stem, data_dir),
+                bc.stem, binary_size, runtime,
+            )
+        result = (text_size, binary_size, runtime, err)
+        if on_result is not None:
+            on_result(bc, result)
+        results.append(result)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Source patching
 # ---------------------------------------------------------------------------
 
 def patch_source(program_path: str, config: EvalConfig):
-    """Copy evolved source into the LLVM tree. Returns ``(dest, backup)``."""
+    """Swap evolved source into the LLVM tree. Returns ``(dest, backup)``.
+
+    The original is kept as a hard link and the candidate is renamed over
+    *dest*, so neither file is ever half-written. A backup left behind by
+    an interrupted run still holds the original and is kept. The candidate
+    gets a fresh mtime so ninja always sees it as newer than the objects.
+    """
     dest = os.path.join(config.llvm_src, config.target_file)
     backup = dest + ".evolve.bak"
-    if os.path.exists(dest):
-        shutil.copy2(dest, backup)
-    shutil.copy2(program_path, dest)
+    if os.path.exists(dest) and not os.path.exists(backup):
+        try:
+            os.link(dest, backup)
+        except OSError:
+            shutil.copy2(dest, backup)
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    shutil.copyfile(program_path, tmp)
+    os.replace(tmp, dest)
     return dest, backup
 
 
 def restore_source(dest: str, backup: str):
     """Restore the original LLVM source from *backup*."""
     if os.path.exists(backup):
-        shutil.move(backup, dest)
+        os.replace(backup, dest)
 
 
 # ---------------------------------------------------------------------------
 # LLVM build
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
+def _warn_no_launcher(build_dir: str):
+    """Warn once per build dir that is not configured with a ccache launcher."""
+    try:
+        cmake_cache = Path(build_dir, "CMakeCache.txt").read_text(errors="replace")
+    except OSError:
+        return
+    if "CMAKE_CXX_COMPILER_LAUNCHER:STRING=ccache" not in cmake_cache:
+        print(f"  Warning: {build_dir} is not configured with "
+              "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache; rebuilds will be slow")
+
+
+@functools.lru_cache(maxsize=None)
+def ninja_quiet_flags(ninja: str):
+    """``["--quiet"]`` if *ninja* supports it (1.11+), else nothing."""
+    try:
+        out = subprocess.run([ninja, "--version"], capture_output=True,
+                             text=True, timeout=10).stdout
+        version = tuple(int(x) for x in out.strip().split(".")[:2])
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return []
+    return ["--quiet"] if version >= (1, 11) else []
+
+
+def ccache_env(build_dir: str):
+    """Copy of the environment with the persistent ccache for *build_dir*.
+
+    The one place the cache location (``<build_dir>/.ccache``) and size are
+    chosen; ``EvalConfig`` builds and ``MagellanEvaluator`` share it. Explicit
+    ``CCACHE_*`` variables win. Sloppiness lets candidates that differ only
+    in comments or ``// [hyperparam]`` lines hit the cache.
+    """
+    env = os.environ.copy()
+    if shutil.which("ccache") is None:
+        return env
+    _warn_no_launcher(build_dir)
+    env.setdefault("CCACHE_DIR", os.path.join(build_dir, ".ccache"))
+    env.setdefault("CCACHE_MAXSIZE", "5G")
+    env.setdefault("CCACHE_SLOPPINESS", "time_macros,include_file_mtime")
+    return env
+
+
+def _build_env(config: EvalConfig):
+    """Env for ninja: no status lines, C locale, and a persistent ccache.
+
+    The C locale keeps compiler diagnostics matchable by ``error:``.
+    """
+    env = ccache_env(config.build_dir)
+    env["NINJA_STATUS"] = ""
+    env["LC_ALL"] = "C"
+    return env
+
+
 def build_llvm(config: EvalConfig):
     """Incremental ninja build. Returns ``(success, build_time, error)``."""
     build_targets = config.build_targets.split()
-    cmd = [config.ninja, "-C", config.build_dir] + build_targets
+    # -l: don't start new jobs while concurrent evaluations load the machine
+    cmd = ([config.ninja] + ninja_quiet_flags(config.ninja)
+           + ["-C", config.build_dir, "-l", str(os.cpu_count() or 1)])
+    if config.ninja_jobs > 0:
+        cmd += ["-j", str(config.ninja_jobs)]
+    cmd += build_targets
+    env = _build_env(config)
 
     start = time.time()
-    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    # ninja forwards compiler diagnostics on stdout; the first errors are
+    # the useful ones
+    rc, log = _run_logged(cmd, 600, limit=1 << 16, env=env)
     build_time = round(time.time() - start, 2)
 
-    if proc.returncode != 0:
-        lines = proc.stderr.strip().split("\n")
+    if rc != 0:
+        lines = log.strip().split("\n")
         err_lines = [l for l in lines if "error:" in l.lower()]
         error = "\n".join(err_lines[:10]) if err_lines else "\n".join(lines[-10:])
         return False, build_time, error
+
+    if config.worker:
+        # Out-of-tree worker links the static libs just rebuilt; relink it
+        rc, log = _run_logged(
+            [config.ninja, "-C", os.path.dirname(config.worker)],
+            600, tail=True, env=env,
+        )
+        build_time = round(time.time() - start, 2)
+        if rc != 0:
+            return False, build_time, f"worker relink failed: {log}"
     return True, build_time, None
 
 
+def quick_check(benchmarks, opt_path, llc_path, evolved_opt_flags=None,
+                evolved_llc_flags=None, timeout=10):
+    """Run the evolved tool once on the smallest benchmark, discarding output.
+
+    Catches heuristics that crash or hang opt/llc before paying for the
+    full compile+run sweep. Runs at -O2, since -O0 never consults the
+    inliner or the greedy allocator. Returns an error string or ``None``.
+    """
+    bc_path = str(min(benchmarks, key=lambda p: Path(p).stat().st_size))
+    cmds = []
+    if evolved_opt_flags:
+        cmds.append([opt_path, "-O2"] + list(evolved_opt_flags)
+                    + [bc_path, "-disable-output"])
+    if evolved_llc_flags:
+        cmds.append([llc_path, "-O2"] + list(evolved_llc_flags)
+                    + [bc_path, "-filetype=null", "-o", os.devnull])
+    for cmd in cmds:
+        try:
+            proc = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return f"quick check timed out ({timeout}s)"
+        if proc.returncode != 0:
+            tool = os.path.basename(cmd[0])
+            return f"heuristic crashes {tool}"
+    return None
+
+
+def _build_stamp(config: EvalConfig) -> Path:
+    return Path(config.build_dir) / ".evolve_stamp.json"
+
+
+def _built_outputs(config: EvalConfig):
+    """mtime_ns of each build target (and the worker), None if one is missing."""
+    paths = [os.path.join(config.build_dir, t) for t in config.build_targets.split()]
+    if config.worker:
+        paths.append(config.worker)
+    try:
+        return {p: os.stat(p).st_mtime_ns for p in paths}
+    except OSError:
+        return None
+
+
+def _source_digest(program_path, config: EvalConfig) -> str:
+    h = hashlib.sha256(Path(program_path).read_bytes())
+    h.update(config.target_file.encode())
+    return h.hexdigest()
+
+
+def built_from(program_path, config: EvalConfig) -> bool:
+    """True if the binaries in the build dir were last built from *program_path*.
+
+    The patched file is restored after every evaluation, so its contents
+    say nothing about the binaries; a stamp written by :func:`mark_built`
+    does, as long as none of the outputs changed since.
+    """
+    try:
+        with open(_build_stamp(config)) as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (stamp.get("source") == _source_digest(program_path, config)
+            and stamp.get("outputs") == _built_outputs(config))
+
+
+def mark_built(program_path, config: EvalConfig):
+    """Record that the current binaries were built from *program_path*."""
+    outputs = _built_outputs(config)
+    if outputs is not None:
+        _save_json(_build_stamp(config), {
+            "source": _source_digest(program_path, config), "outputs": outputs,
+        })
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+def _result_path(program_path, config: EvalConfig):
+    """Cache file for evaluating *program_path* under *config*."""
+    h = hashlib.sha256(Path(program_path).read_bytes())
+    h.update(json.dumps([
+        config.llvm_src, config.build_dir, config.target_file,
+        config.data_dir, config.optuna_trials, config.optuna_subset, config.worker,
+        [benchmark_key(bc) for bc in find_benchmarks(Path(config.testsuite_dir))],
+        runtime_metric(),
+    ]).encode())
+    return Path(config.result_cache) / f"{h.hexdigest()}.json"
+
+
+def load_cached_result(program_path, config: EvalConfig):
+    """Return the stored result dict for an identical program, or None."""
+    if config.result_cache_max <= 0:
+        return None
+    path = _result_path(program_path, config)
+    try:
+        with open(path) as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # mtime doubles as LRU timestamp
+    except OSError:
+        pass
+    return result
+
+
+def _complete(result) -> bool:
+    """True if *result* has no error and every run benchmark has a speedup.
+
+    A configured benchmark whose run timed out or failed leaves no runtime
+    and no speedup without setting ``error``; that degraded score must not
+    be cached under the program for good.
+    """
+    if result.get("error") is not None:
+        return False
+    if runtime_metric() == "none":
+        return True
+    return all(
+        info.get("runtime") is not None and info.get("speedup") is not None
+        for name, info in result.get("benchmark_details", {}).items()
+        if Path(name).stem in BENCH_RUN_CONFIGS
+    )
+
+
+def store_cached_result(program_path, config: EvalConfig, result):
+    """Store *result* for *program_path*, evicting the least recently used.
+
+    Incomplete results (see :func:`_complete`) are not stored.
+    """
+    if config.result_cache_max <= 0 or not _complete(result):
+        return
+    path = _result_path(program_path, config)
+    _save_json(path, result)
+    try:
+        entries = sorted(path.parent.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for old in entries[:max(0, len(entries) - config.result_cache_max)]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Baseline
 # ---------------------------------------------------------------------------
 
-def load_baseline(config: EvalConfig):
-    """Load or compute baseline (default LLVM, no evolved flags) measurements."""
+# .bc digests memoized by (size, mtime_ns), per process and in a sidecar
+# next to the bitcode, so evaluator invocations don't rehash the test-suite
+_BC_DIGEST_FILE = ".bc_digests.json"
+_BC_DIGESTS = {}
+
+
+def _bc_digest(bc_path: Path) -> str:
+    """sha256 hex of *bc_path*, reused while its size and mtime are unchanged."""
+    st = bc_path.stat()
+    stamp = [st.st_size, st.st_mtime_ns]
+    sidecar = bc_path.parent / _BC_DIGEST_FILE
+    if sidecar not in _BC_DIGESTS:
+        try:
+            with open(sidecar) as f:
+                _BC_DIGESTS[sidecar] = json.load(f)
+        except (OSError, ValueError):
+            _BC_DIGESTS[sidecar] = {}
+    known = _BC_DIGESTS[sidecar]
+    entry = known.get(bc_path.name)
+    if isinstance(entry, dict) and entry.get("stat") == stamp:
+        return entry["sha256"]
+    digest = hashlib.sha256(bc_path.read_bytes()).hexdigest()
+    known[bc_path.name] = {"stat": stamp, "sha256": digest}
+    _save_json(sidecar, known)
+    return digest
+
+
+def benchmark_key(bc_path) -> str:
+    """Cache key for one benchmark's measurements.
+
+    Covers the bitcode contents and how the benchmark is linked and run.
+    opt/llc are deliberately left out: every candidate rebuilds them, while
+    their default (non-evolved) code paths stay the same.
+    """
+    bc_path = Path(bc_path)
+    h = hashlib.sha256(_bc_digest(bc_path).encode())
+    name = bc_path.stem
+    h.update(json.dumps(
+        [BENCH_RUN_CONFIGS.get(name), link_flags(name), runtime_metric(),
+         sorted(bench_cpus() or ())],
+        sort_keys=True,
+    ).encode())
+    return h.hexdigest()[:16]
+
+
+def _save_json(path: Path, data):
+    """Atomically (re)write *path*; best effort, errors are ignored."""
+    try:
+        os.makedirs(path.parent, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+_JSON_MEMO = {}
+
+
+def _load_json(path: Path):
+    """Parsed JSON at *path*, reused while its mtime and size are unchanged.
+
+    Returns ``{}`` if the file is missing or unreadable. Callers must not
+    mutate the result.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_MEMO.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        data = {}
+    _JSON_MEMO[path] = (stamp, data)
+    return data
+
+
+def load_baseline(config: EvalConfig, cached_only=False):
+    """Load or compute baseline (default LLVM, no evolved flags) measurements.
+
+    The cache file maps each benchmark name to its measurements plus a
+    ``key`` from :func:`benchmark_key`; only benchmarks that are missing or
+    whose key changed are recompiled, and the file is rewritten after each
+    one so an interrupted run keeps its progress. A benchmark that fails (or
+    yields no text size) is stored as ``{"key": ..., "error": ...}`` so it is
+    not recompiled by every evaluation; such entries are left out of the
+    returned dict. Delete the file (or the entry) to retry them. With
+    *cached_only*, returns None instead of compiling anything.
+    """
     baseline_path = Path(config.baseline_file)
-    if baseline_path.exists():
-        with open(baseline_path) as f:
-            return json.load(f)
+    benchmarks = find_benchmarks(Path(config.testsuite_dir))
+    if not benchmarks:
+        return {}
+
+    cached = _load_json(baseline_path)
+    keys = {bc.name: benchmark_key(bc) for bc in benchmarks}
+    known = {
+        name: entry for name, entry in cached.items()
+        if isinstance(entry, dict) and entry.get("key") == keys.get(name)
+    }
+    stale = [bc for bc in benchmarks if bc.name not in known]
+    if not stale:
+        return _measured(known)
+    if cached_only:
+        return None
 
     opt_path = os.path.join(config.build_dir, "bin", "opt")
     llc_path = os.path.join(config.build_dir, "bin", "llc")
-    benchmarks = find_benchmarks(Path(config.testsuite_dir))
 
-    if not benchmarks:
-        return {}
+    def record(bc, result):
+        text_size, binary_size, runtime, err = result
+        print(f"  Baseline: {bc.stem}...", end=" ", flush=True)
+        if err or text_size is None:
+            err = err or "no text size"
+            known[bc.name] = {"key": keys[bc.name], "error": err}
+            print(f"ERROR: {err}")
+        else:
+            entry = {"key": keys[bc.name], "text_size": text_size, "runtime": runtime}
+            if binary_size is not None:
+                entry["binary_size"] = binary_size
+            known[bc.name] = entry
+            print(f"text={text_size}, binary={binary_size}, runtime={runtime}")
+        _save_json(baseline_path, known)
+
+    warm_data(config.data_dir, stale)
+    with tempfile.TemporaryDirectory(prefix="evolve_baseline_", dir=scratch_dir()) as tmp_dir:
+        compile_benchmarks(
+            stale, opt_path, llc_path, tmp_dir, config.data_dir,
+            opt_timeout=config.opt_timeout, jobs=config.jobs,
+            cache_dir=config.compile_cache or None, on_result=record,
+            worker=config.worker or None,
+        )
+    print(f"  Baseline saved to {baseline_path}")
 
-    baseline = {}
-    with tempfile.TemporaryDirectory(prefix="evolve_baseline_") as tmp_dir:
-        for bc in benchmarks:
-            print(f"  Baseline: {bc.stem}...", end=" ", flush=True)
-            text_size, binary_size, runtime, err = compile_benchmark(
-                bc, opt_path, llc_path, tmp_dir, config.data_dir,
-                opt_timeout=config.opt_timeout,
-            )
-            if err:
-                print(f"ERROR: {err}")
-            elif text_size is not None:
-                entry = {"text_size": text_size, "runtime": runtime}
-                if binary_size is not None:
-                    entry["binary_size"] = binary_size
-                baseline[bc.name] = entry
-                print(f"text={text_size}, binary={binary_size}, runtime={runtime}")
-            else:
-                print("SKIP (no text size)")
+    return _measured(known)
+
+
+def _measured(baseline):
+    """*baseline* without the entries recording a failed measurement."""
+    return {name: entry for name, entry in baseline.items() if "error" not in entry}
 
-    try:
-        os.makedirs(baseline_path.parent, exist_ok=True)
-        with open(baseline_path, "w") as f:
-            json.dump(baseline, f, indent=2)
-        print(f"  Baseline saved to {baseline_path}")
-    except OSError:
-        pass
 
-    return baseline
+def prefetch_baseline(config: EvalConfig):
+    """Start reading a fully cached baseline on a background thread.
+
+    Meant to overlap with :func:`build_llvm`. Returns a callable giving the
+    baseline; if any entry is stale, it is recompiled by the callable,
+    i.e. only after the build has finished writing opt/llc.
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(load_baseline, config, cached_only=True)
+    pool.shutdown(wait=False)
+
+    def result():
+        baseline = future.result()
+        return baseline if baseline is not None else load_baseline(config)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -455,7 +1544,8 @@ def load_baseline(config: EvalConfig):
 
 def eval_benchmarks(benchmarks, opt_path, llc_path, baseline, tmp_dir,
                     data_dir, score_fn, evolved_opt_flags=None,
-                    evolved_llc_flags=None, opt_timeout=120):
+                    evolved_llc_flags=None, opt_timeout=120, jobs=0,
+                    cache_dir=None, worker=None):
     """Compile and score benchmarks.
 
     *score_fn(total_binary, baseline_total_binary, speedups)* computes the
@@ -472,14 +1562,21 @@ def eval_benchmarks(benchmarks, opt_path, llc_path, baseline, tmp_dir,
     details = {}
     errors = []
 
-    for bc in benchmarks:
-        text_size, binary_size, runtime, err = compile_benchmark(
-            bc, opt_path, llc_path, tmp_dir, data_dir,
-            evolved_opt_flags=evolved_opt_flags,
-            evolved_llc_flags=evolved_llc_flags,
-            opt_timeout=opt_timeout,
-        )
-        bl = baseline.get(bc.name, {})
+    results = compile_benchmarks(
+        benchmarks, opt_path, llc_path, tmp_dir, data_dir,
+        evolved_opt_flags=evolved_opt_flags,
+        evolved_llc_flags=evolved_llc_flags,
+        opt_timeout=opt_timeout, jobs=jobs, cache_dir=cache_dir,
+        worker=worker,
+    )
+    # Baseline numbers aligned with *benchmarks*, looked up once per call
+    bl_rows = [
+        (bl.get("text_size"), bl.get("binary_size"), bl.get("runtime"))
+        for bl in (baseline.get(bc.name, {}) for bc in benchmarks)
+    ]
+    for bc, (text_size, binary_size, runtime, err), (bl_text, bl_binary, bl_rt) in zip(
+        benchmarks, results, bl_rows,
+    ):
         info = {
             "text_size": text_size,
             "binary_size": binary_size,
@@ -492,7 +1589,8 @@ def eval_benchmarks(benchmarks, opt_path, llc_path, baseline, tmp_dir,
 
         if text_size is not None:
             total_text += text_size
-            bl_text = bl.get("text_size", text_size)
+            if bl_text is None:
+                bl_text = text_size
             baseline_total_text += bl_text
             if bl_text > 0:
                 info["text_reduction_pct"] = round(
@@ -501,17 +1599,18 @@ def eval_benchmarks(benchmarks, opt_path, llc_path, baseline, tmp_dir,
 
         if binary_size is not None:
             total_binary += binary_size
-            bl_binary = bl.get("binary_size", binary_size)
+            if bl_binary is None:
+                bl_binary = binary_size
             baseline_total_binary += bl_binary
             if bl_binary > 0:
                 info["binary_reduction_pct"] = round(
                     100.0 * (bl_binary - binary_size) / bl_binary, 4
                 )
 
-        bl_rt = bl.get("runtime")
-        if runtime is not None and bl_rt and bl_rt > 0:
-            info["speedup"] = round(bl_rt / runtime, 4)
-            speedups.append(bl_rt / runtime)
+        if runtime and runtime > 0 and bl_rt and bl_rt > 0:
+            speedup = bl_rt / runtime
+            info["speedup"] = round(speedup, 4)
+            speedups.append(speedup)
 
         details[bc.name] = info
 
@@ -533,14 +1632,91 @@ def eval_benchmarks(benchmarks, opt_path, llc_path, baseline, tmp_dir,
 # Optuna tuning
 # ---------------------------------------------------------------------------
 
+def _hyperparam_flags(hyperparams, values):
+    return [f"-{name}={val}" for (name, _, _, _), val in zip(hyperparams, values)]
+
+
+def pick_tuning_subset(benchmarks, opt_path, llc_path, hyperparams, data_dir,
+                       k=3, pilots=3, base_opt_flags=None, base_llc_flags=None,
+                       flag_target="opt", opt_timeout=120, jobs=0,
+                       cache_dir=None, subset_cache=None, seed=0, worker=None):
+    """Pick the *k* benchmarks whose runtime reacts most to the hyperparams.
+
+    Compiles and runs every benchmark under *pilots* random hyperparam
+    settings and ranks them by runtime coefficient of variation. The pick is
+    stored in the *subset_cache* JSON file, keyed on the benchmark keys,
+    the hyperparam space and the fixed flags.
+
+    Returns a list of benchmark stems (may be shorter than *k*, or empty).
+    """
+    if runtime_metric() == "none":
+        return []
+    key = hashlib.sha256(json.dumps([
+        [benchmark_key(bc) for bc in benchmarks], hyperparams, flag_target,
+        base_opt_flags, base_llc_flags, k, pilots, seed,
+    ]).encode()).hexdigest()[:16]
+    cache_path = Path(subset_cache) if subset_cache else None
+    cached = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        if key in cached:
+            return cached[key]
+
+    rng = random.Random(seed)
+    runtimes = {bc.stem: [] for bc in benchmarks}
+    for _ in range(pilots):
+        values = [
+            rng.randint(lo, hi) if type_str == "int" else rng.uniform(lo, hi)
+            for _, type_str, lo, hi in hyperparams
+        ]
+        flags = _hyperparam_flags(hyperparams, values)
+        opt_flags = list(base_opt_flags or [])
+        llc_flags = list(base_llc_flags or [])
+        (opt_flags if flag_target == "opt" else llc_flags).extend(flags)
+        with tempfile.TemporaryDirectory(prefix="optuna_pilot_", dir=scratch_dir()) as pilot_dir:
+            results = compile_benchmarks(
+                benchmarks, opt_path, llc_path, pilot_dir, data_dir,
+                evolved_opt_flags=opt_flags or None,
+                evolved_llc_flags=llc_flags or None,
+                opt_timeout=opt_timeout, jobs=jobs, cache_dir=cache_dir,
+                worker=worker,
+            )
+        for bc, (_, _, runtime, _) in zip(benchmarks, results):
+            if runtime is not None:
+                runtimes[bc.stem].append(runtime)
+
+    cv = {
+        name: statistics.pstdev(rts) / statistics.fmean(rts)
+        for name, rts in runtimes.items()
+        if len(rts) >= 2 and statistics.fmean(rts) > 0
+    }
+    subset = sorted(cv, key=cv.get, reverse=True)[:k]
+    if cache_path is not None:
+        cached[key] = subset
+        _save_json(cache_path, cached)
+    return subset
+
+
 def optuna_tune(opt_path, llc_path, benchmarks, baseline, n_trials,
                 hyperparams, data_dir, score_fn, opt_timeout=120,
                 optuna_subset=None, base_opt_flags=None,
-                base_llc_flags=None, flag_target="opt"):
+                base_llc_flags=None, flag_target="opt", jobs=0,
+                cache_dir=None, n_jobs=1, subset_cache=None, worker=None):
     """Run Optuna trials on a benchmark subset to tune ``[hyperparam]`` knobs.
 
     *flag_target*: ``"opt"`` or ``"llc"`` — where hyperparam flags are injected.
     *base_opt_flags* / *base_llc_flags*: fixed evolved flags always applied.
+    *optuna_subset*: benchmark stems to tune on; None picks them with
+    :func:`pick_tuning_subset` (cached in *subset_cache*).
+    *n_jobs*: concurrent trials. Trials then run benchmarks at the same
+    time, so keep 1 when the score includes runtime speedups.
+
+    Budgets of at most ``QMC_MAX_TRIALS`` use Optuna's Sobol QMC sampler,
+    larger ones the default TPE sampler.
 
     Returns ``(best_score, best_params_dict, best_flags_list)``.
     """
@@ -550,6 +1726,14 @@ def optuna_tune(opt_path, llc_path, benchmarks, baseline, n_trials,
 
     optuna.logging.set_verbosity(optuna.logging.WARNING)
 
+    if optuna_subset is None:
+        optuna_subset = pick_tuning_subset(
+            benchmarks, opt_path, llc_path, hyperparams, data_dir,
+            base_opt_flags=base_opt_flags, base_llc_flags=base_llc_flags,
+            flag_target=flag_target, opt_timeout=opt_timeout, jobs=jobs,
+            cache_dir=cache_dir, subset_cache=subset_cache, worker=worker,
+        )
+        print(f"  Optuna subset (auto): {optuna_subset}")
     subset_names = set(optuna_subset or ["sqlite3", "spass", "tramp3d-v4"])
     subset_bcs = [bc for bc in benchmarks if bc.stem in subset_names]
     if not subset_bcs:
@@ -571,18 +1755,26 @@ def optuna_tune(opt_path, llc_path, benchmarks, baseline, n_trials,
         else:
             llc_flags.extend(flags)
 
-        with tempfile.TemporaryDirectory(prefix="optuna_trial_") as trial_dir:
-            score, _ = eval_benchmarks(
-                subset_bcs, opt_path, llc_path, baseline, trial_dir,
-                data_dir, score_fn,
-                evolved_opt_flags=opt_flags or None,
-                evolved_llc_flags=llc_flags or None,
-                opt_timeout=opt_timeout,
-            )
+        # Trial dirs live under one study dir and are removed with it
+        trial_dir = os.path.join(study_dir, f"trial_{trial.number}")
+        os.makedirs(trial_dir)
+        score, _ = eval_benchmarks(
+            subset_bcs, opt_path, llc_path, baseline, trial_dir,
+            data_dir, score_fn,
+            evolved_opt_flags=opt_flags or None,
+            evolved_llc_flags=llc_flags or None,
+            opt_timeout=opt_timeout, jobs=jobs, cache_dir=cache_dir,
+            worker=worker,
+        )
         return score
 
-    study = optuna.create_study(direction="maximize")
-    study.optimize(objective, n_trials=n_trials)
+    warm_data(data_dir, subset_bcs)
+    sampler = None
+    if _OPTUNA_HAS_QMC and n_trials <= QMC_MAX_TRIALS:
+        sampler = optuna.samplers.QMCSampler(qmc_type="sobol", warn_independent_sampling=False)
+    study = optuna.create_study(direction="maximize", sampler=sampler)
+    with tempfile.TemporaryDirectory(prefix="optuna_study_", dir=scratch_dir()) as study_dir:
+        study.optimize(objective, n_trials=n_trials, n_jobs=n_jobs)
 
     best_params = study.best_params
     best_flags = [f"-{k}={v}" for k, v in best_params.items()]
@@ -25,16 +25,24 @@ from pathlib import Path
 try:
     from ..llvm_bench import (
         EvalConfig, build_llvm, eval_benchmarks, extract_hyperparams,
-        find_benchmarks, load_baseline, optuna_tune, patch_source,
-        restore_source,
+        find_benchmarks, prefetch_baseline, optuna_tune, patch_source,
+        restore_source, scratch_dir, load_cached_result, store_cached_result,
+        quick_check, built_from, mark_built,
     )
 except ImportError:
-    # Standalone loading by OpenEvolve's importlib (no parent package)
+    # Standalone loading by OpenEvolve's importlib (no parent package).
+    # Reuse the package copy if it is loaded, so caches and the worker pool
+    # aren't initialized twice in one process.
+    if "mlirAgent.evolve.tasks.llvm_bench" in sys.modules:
+        sys.modules.setdefault(
+            "llvm_bench", sys.modules["mlirAgent.evolve.tasks.llvm_bench"]
+        )
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
     from llvm_bench import (
         EvalConfig, build_llvm, eval_benchmarks, extract_hyperparams,
-        find_benchmarks, load_baseline, optuna_tune, patch_source,
-        restore_source,
+        find_benchmarks, prefetch_baseline, optuna_tune, patch_source,
+        restore_source, scratch_dir, load_cached_result, store_cached_result,
+        quick_check, built_from, mark_built,
     )
 
 
@@ -65,6 +73,11 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
             "error": "LLVM_SRC_PATH and EVOLVE_BUILD_DIR must be set",
         }
 
+    # Identical candidates are common; reuse their stored result
+    cached = load_cached_result(program_path, config)
+    if cached is not None:
+        return cached
+
     result = {
         "combined_score": 0.0,
         "build_success": False,
@@ -78,21 +91,30 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
         "error": None,
     }
 
-    try:
-        dest, backup = patch_source(program_path, config)
-    except OSError as e:
-        result["error"] = f"Patch failed: {e}"
-        return result
-
-    try:
-        ok, build_time, err = build_llvm(config)
-        result["build_time"] = build_time
-        result["build_success"] = ok
-        if not ok:
-            result["error"] = err
+    # Re-evaluating the source opt/llc were last built from needs no rebuild
+    rebuild = not built_from(program_path, config)
+    dest = backup = None
+    if rebuild:
+        try:
+            dest, backup = patch_source(program_path, config)
+        except OSError as e:
+            result["error"] = f"Patch failed: {e}"
             return result
 
-        baseline = load_baseline(config)
+    get_baseline = prefetch_baseline(config)
+    try:
+        if rebuild:
+            ok, build_time, err = build_llvm(config)
+            result["build_time"] = build_time
+            result["build_success"] = ok
+            if not ok:
+                result["error"] = err
+                return result
+            mark_built(program_path, config)
+        else:
+            result["build_success"] = True
+
+        baseline = get_baseline()
         opt_path = os.path.join(config.build_dir, "bin", "opt")
         llc_path = os.path.join(config.build_dir, "bin", "llc")
         benchmarks = find_benchmarks(Path(config.testsuite_dir))
@@ -108,16 +130,28 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
 
         evolved_opt_flags = ["-use-evolved-inline-cost"]
 
+        if config.quick_check:
+            err = quick_check(
+                benchmarks, opt_path, llc_path,
+                evolved_opt_flags=evolved_opt_flags,
+            )
+            if err:
+                result["error"] = err
+                return result
+
         if hyperparams and config.optuna_trials > 0:
             print(f"  Optuna: tuning {len(hyperparams)} hyperparams "
-                  f"({config.optuna_trials} trials on {config.optuna_subset})...")
+                  f"({config.optuna_trials} trials on {config.optuna_subset or 'auto'})...")
             tune_start = time.time()
             best_sub, best_params, extra_flags = optuna_tune(
                 opt_path, llc_path, benchmarks, baseline,
                 n_trials=config.optuna_trials, hyperparams=hyperparams,
                 data_dir=config.data_dir, score_fn=_score,
-                opt_timeout=config.opt_timeout,
-                optuna_subset=config.optuna_subset,
+                opt_timeout=config.opt_timeout, jobs=config.jobs,
+                cache_dir=config.compile_cache or None,
+                worker=config.worker or None,
+                optuna_subset=config.optuna_subset, n_jobs=config.optuna_jobs,
+                subset_cache=config.subset_cache_file,
                 base_opt_flags=evolved_opt_flags, flag_target="opt",
             )
             result["optuna_trials"] = config.optuna_trials
@@ -132,12 +166,16 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
             result["tuned_params"] = {}
 
         # Final evaluation on ALL benchmarks
-        with tempfile.TemporaryDirectory(prefix="evolve_eval_") as tmp_dir:
+        with tempfile.TemporaryDirectory(
+            prefix="evolve_eval_", dir=scratch_dir(),
+        ) as tmp_dir:
             score, ev = eval_benchmarks(
                 benchmarks, opt_path, llc_path, baseline, tmp_dir,
                 config.data_dir, _score,
                 evolved_opt_flags=evolved_opt_flags,
-                opt_timeout=config.opt_timeout,
+                opt_timeout=config.opt_timeout, jobs=config.jobs,
+                cache_dir=config.compile_cache or None,
+                worker=config.worker or None,
             )
 
         result["combined_score"] = score
@@ -165,8 +203,11 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
     except subprocess.TimeoutExpired:
         result["error"] = "Build timed out (600s)"
     finally:
-        restore_source(dest, backup)
+        if dest is not None:
+            restore_source(dest, backup)
 
+    # Skips errors and runs with a missing benchmark runtime
+    store_cached_result(program_path, config, result)
     return result
 
 
@@ -16,6 +16,7 @@ Pipeline:
 
 import json
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -25,16 +26,24 @@ from pathlib import Path
 try:
     from ..llvm_bench import (
         EvalConfig, build_llvm, eval_benchmarks, extract_hyperparams,
-        find_benchmarks, load_baseline, optuna_tune, patch_source,
-        restore_source,
+        find_benchmarks, prefetch_baseline, optuna_tune, patch_source,
+        restore_source, scratch_dir, load_cached_result, store_cached_result,
+        quick_check, built_from, mark_built,
     )
 except ImportError:
-    # Standalone loading by OpenEvolve's importlib (no parent package)
+    # Standalone loading by OpenEvolve's importlib (no parent package).
+    # Reuse the package copy if it is loaded, so caches and the worker pool
+    # aren't initialized twice in one process.
+    if "mlirAgent.evolve.tasks.llvm_bench" in sys.modules:
+        sys.modules.setdefault(
+            "llvm_bench", sys.modules["mlirAgent.evolve.tasks.llvm_bench"]
+        )
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
     from llvm_bench import (
         EvalConfig, build_llvm, eval_benchmarks, extract_hyperparams,
-        find_benchmarks, load_baseline, optuna_tune, patch_source,
-        restore_source,
+        find_benchmarks, prefetch_baseline, optuna_tune, patch_source,
+        restore_source, scratch_dir, load_cached_result, store_cached_result,
+        quick_check, built_from, mark_built,
     )
 
 _EVAL_DIR = Path(__file__).resolve().parent
@@ -70,6 +79,11 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
             "error": "LLVM_SRC_PATH and EVOLVE_BUILD_DIR must be set",
         }
 
+    # Identical candidates are common; reuse their stored result
+    cached = load_cached_result(program_path, config)
+    if cached is not None:
+        return cached
+
     result = {
         "combined_score": 0.0,
         "build_success": False,
@@ -81,21 +95,31 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
         "error": None,
     }
 
-    try:
-        dest, backup = patch_source(program_path, config)
-    except OSError as e:
-        result["error"] = f"Patch failed: {e}"
-        return result
-
-    try:
-        ok, build_time, err = build_llvm(config)
-        result["build_time"] = build_time
-        result["build_success"] = ok
-        if not ok:
-            result["error"] = err
+    # Re-evaluating the source opt/llc were last built from needs no rebuild
+    rebuild = not built_from(program_path, config)
+    dest = backup = None
+    if rebuild:
+        try:
+            dest, backup = patch_source(program_path, config)
+        except OSError as e:
+            result["error"] = f"Patch failed: {e}"
             return result
 
-        baseline = load_baseline(config)
+    get_baseline = prefetch_baseline(config)
+    scratch_cache = None
+    try:
+        if rebuild:
+            ok, build_time, err = build_llvm(config)
+            result["build_time"] = build_time
+            result["build_success"] = ok
+            if not ok:
+                result["error"] = err
+                return result
+            mark_built(program_path, config)
+        else:
+            result["build_success"] = True
+
+        baseline = get_baseline()
         opt_path = os.path.join(config.build_dir, "bin", "opt")
         llc_path = os.path.join(config.build_dir, "bin", "llc")
         benchmarks = find_benchmarks(Path(config.testsuite_dir))
@@ -110,7 +134,25 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
 
         evolved_llc_flags = ["-use-evolved-regalloc-priority"]
 
-        if hyperparams and config.optuna_trials > 0:
+        # opt gets no evolved flags, so its output is the same for every
+        # Optuna trial and the final run; without a persistent compile cache,
+        # share a throwaway one across them
+        cache_dir = config.compile_cache or None
+        tuning = bool(hyperparams) and config.optuna_trials > 0
+        if cache_dir is None and not config.worker and tuning:
+            scratch_cache = tempfile.mkdtemp(prefix="regalloc_opt_", dir=scratch_dir())
+            cache_dir = scratch_cache
+
+        if config.quick_check:
+            err = quick_check(
+                benchmarks, opt_path, llc_path,
+                evolved_llc_flags=evolved_llc_flags,
+            )
+            if err:
+                result["error"] = err
+                return result
+
+        if tuning:
             print(f"  Optuna: tuning {len(hyperparams)} hyperparams "
                   f"({config.optuna_trials} trials)...")
             tune_start = time.time()
@@ -118,8 +160,11 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
                 opt_path, llc_path, benchmarks, baseline,
                 n_trials=config.optuna_trials, hyperparams=hyperparams,
                 data_dir=config.data_dir, score_fn=_score,
-                opt_timeout=config.opt_timeout,
-                optuna_subset=config.optuna_subset,
+                opt_timeout=config.opt_timeout, jobs=config.jobs,
+                cache_dir=cache_dir,
+                worker=config.worker or None,
+                optuna_subset=config.optuna_subset, n_jobs=config.optuna_jobs,
+                subset_cache=config.subset_cache_file,
                 base_llc_flags=evolved_llc_flags, flag_target="llc",
             )
             result["optuna_trials"] = config.optuna_trials
@@ -132,12 +177,16 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
             result["tuned_params"] = {}
 
         # Final evaluation on all benchmarks
-        with tempfile.TemporaryDirectory(prefix="regalloc_eval_") as tmp_dir:
+        with tempfile.TemporaryDirectory(
+            prefix="regalloc_eval_", dir=scratch_dir(),
+        ) as tmp_dir:
             score, ev = eval_benchmarks(
                 benchmarks, opt_path, llc_path, baseline, tmp_dir,
                 config.data_dir, _score,
                 evolved_llc_flags=evolved_llc_flags,
-                opt_timeout=config.opt_timeout,
+                opt_timeout=config.opt_timeout, jobs=config.jobs,
+                cache_dir=cache_dir,
+                worker=config.worker or None,
             )
 
         result["combined_score"] = score
@@ -159,8 +208,13 @@ def evaluate(program_path: str, config: EvalConfig = None) -> dict:
     except subprocess.TimeoutExpired:
         result["error"] = "Build timed out (600s)"
     finally:
-        restore_source(dest, backup)
+        if dest is not None:
+            restore_source(dest, backup)
+        if scratch_cache is not None:
+            shutil.rmtree(scratch_cache, ignore_errors=True)
 
+    # Skips errors and runs with a missing benchmark runtime
+    store_cached_result(program_path, config, result)
     return result
 
 
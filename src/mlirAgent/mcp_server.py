@@ -18,6 +18,7 @@ except Exception:
             "Install with: pip install mcp"
         ) from exc
 
+from mlirAgent.config import Config
 from mlirAgent.tools.build import run_build
 from mlirAgent.tools.compiler import run_compile
 from mlirAgent.tools.provenance import MLIRProvenanceTracer
@@ -109,6 +110,7 @@ def provenance_trace_text(artifacts_root: str, source_filename: str, line: int)
 
 
 def main() -> None:
+    Config.validate()
     mcp.run()
 
 
@@ -25,6 +25,7 @@ def run_compile(mlir_content: str, flags: list = None) -> dict:
     timestamp = int(time.time())
     filename = f"compile_{timestamp}_{content_hash}"
     
+    Config.ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
     input_path = Config.ARTIFACTS_DIR / f"{filename}.mlir"
     output_path = Config.ARTIFACTS_DIR / f"{filename}.vmfb"
     
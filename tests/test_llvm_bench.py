@@ -0,0 +1,511 @@
+import os
+import shutil
+import stat
+import struct
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from mlirAgent.evolve.tasks import llvm_bench
+
+
+def _stub_tool(tmp_path, name="tool"):
+    """Shell stand-in for opt/llc: ``tool [-flags] <in> -o <out>`` copies in
+    to out and appends one line to ``calls`` so tests can count invocations."""
+    calls = tmp_path / f"{name}.calls"
+    tool = tmp_path / name
+    tool.write_text(
+        "#!/bin/sh\n"
+        '[ "$1" = --version ] && { echo "stub version 1"; exit 0; }\n'
+        f"echo run >> '{calls}'\n"
+        "while [ $# -gt 0 ]; do\n"
+        '  case "$1" in\n'
+        '    -o) out="$2"; shift 2 ;;\n'
+        "    -*) shift ;;\n"
+        '    *) in="$1"; shift ;;\n'
+        "  esac\n"
+        "done\n"
+        'cp "$in" "$out"\n'
+    )
+    tool.chmod(tool.stat().st_mode | stat.S_IXUSR)
+    return tool, calls
+
+
+def _ncalls(calls):
+    return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def test_run_tool_second_call_is_cache_hit(tmp_path):
+    """An identical invocation with a cache_dir is served from the cache."""
+    tool, calls = _stub_tool(tmp_path)
+    src = tmp_path / "in.bc"
+    src.write_bytes(b"bitcode")
+    cache = tmp_path / "cache"
+    out = tmp_path / "out.bc"
+    cmd = [str(tool), str(src), "-o", str(out)]
+
+    for _ in range(2):
+        err = llvm_bench._run_tool(cmd, str(tool), str(src), ["-O2"], str(out),
+                                   10, cache_dir=str(cache))
+        assert err is None
+        assert out.read_bytes() == b"bitcode"
+
+    assert _ncalls(calls) == 1
+    assert len(os.listdir(cache)) == 1
+
+
+def test_run_tool_reports_failure_output(tmp_path):
+    tool = tmp_path / "bad"
+    tool.write_text("#!/bin/sh\necho 'boom' >&2\nexit 1\n")
+    tool.chmod(0o755)
+    src = tmp_path / "in.bc"
+    src.write_bytes(b"x")
+    err = llvm_bench._run_tool([str(tool)], str(tool), str(src), [],
+                               str(tmp_path / "out"), 10, cache_dir=str(tmp_path / "c"))
+    assert err == "boom\n"
+    assert not (tmp_path / "c").exists() or not os.listdir(tmp_path / "c")
+
+
+def test_cache_key_default_path_survives_tool_rebuild(tmp_path):
+    """Without evolved flags the key ignores the tool's mtime; with them a
+    rebuild (new mtime) invalidates it."""
+    tool, calls = _stub_tool(tmp_path)
+    src = tmp_path / "in.bc"
+    src.write_bytes(b"bitcode")
+    before = (llvm_bench._cache_key(str(tool), str(src), ["-O2"], True),
+              llvm_bench._cache_key(str(tool), str(src), ["-O2"], False))
+
+    st = tool.stat()
+    os.utime(tool, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    after = (llvm_bench._cache_key(str(tool), str(src), ["-O2"], True),
+             llvm_bench._cache_key(str(tool), str(src), ["-O2"], False))
+
+    assert before[0] == after[0]
+    assert before[1] != after[1]
+
+
+def test_cache_key_default_path_tracks_build_identity(tmp_path):
+    """Default-path entries do not outlive a rebuild that changes the tool's
+    size or the build's configuration."""
+    bindir = tmp_path / "build" / "bin"
+    bindir.mkdir(parents=True)
+    tool, _ = _stub_tool(bindir)
+    src = tmp_path / "in.bc"
+    src.write_bytes(b"bitcode")
+    cmake_cache = tmp_path / "build" / "CMakeCache.txt"
+    cmake_cache.write_text("CMAKE_BUILD_TYPE:STRING=Release\n")
+
+    def key():
+        return llvm_bench._cache_key(str(tool), str(src), ["-O2"], True)
+
+    base = key()
+    cmake_cache.write_text("CMAKE_BUILD_TYPE:STRING=Debug\n")
+    st = tool.stat()
+    os.utime(tool, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    reconfigured = key()
+    assert reconfigured != base
+
+    with open(tool, "a") as f:
+        f.write("# relinked with different code\n")
+    os.utime(tool, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert key() not in (base, reconfigured)
+
+
+def test_run_tool_default_path_hits_after_tool_rebuild(tmp_path):
+    tool, calls = _stub_tool(tmp_path)
+    src = tmp_path / "in.bc"
+    src.write_bytes(b"bitcode")
+    out = tmp_path / "out.bc"
+    cmd = [str(tool), str(src), "-o", str(out)]
+    kwargs = dict(cache_dir=str(tmp_path / "cache"), default_path=True)
+
+    assert llvm_bench._run_tool(cmd, str(tool), str(src), ["-O2"], str(out), 10, **kwargs) is None
+    st = tool.stat()
+    os.utime(tool, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert llvm_bench._run_tool(cmd, str(tool), str(src), ["-O2"], str(out), 10, **kwargs) is None
+
+    assert _ncalls(calls) == 1
+    assert out.read_bytes() == b"bitcode"
+
+
+def test_shared_cache_runs_opt_once_across_trials(tmp_path):
+    """Regalloc tuning: opt has no evolved flags, so with a shared cache_dir
+    two trials with different llc flags run opt once and llc twice."""
+    opt, opt_calls = _stub_tool(tmp_path, "opt")
+    llc, llc_calls = _stub_tool(tmp_path, "llc")
+    bc = tmp_path / "bench.bc"
+    bc.write_bytes(b"bitcode")
+    cache = tmp_path / "cache"
+
+    for trial, value in enumerate((1, 2)):
+        trial_dir = tmp_path / f"trial_{trial}"
+        trial_dir.mkdir()
+        llvm_bench.compile_benchmark(
+            bc, str(opt), str(llc), str(trial_dir), str(tmp_path),
+            evolved_llc_flags=["-use-evolved-regalloc-priority", f"-knob={value}"],
+            measure_runtime=False, cache_dir=str(cache),
+        )
+
+    assert _ncalls(opt_calls) == 1
+    assert _ncalls(llc_calls) == 2
+
+
+@pytest.mark.parametrize("version,expected", [
+    ("1.10.2", []), ("1.11.1", ["--quiet"]), ("1.12.0.git", ["--quiet"]), ("junk", []),
+])
+def test_ninja_quiet_flags_probes_version(tmp_path, version, expected):
+    ninja = tmp_path / "ninja"
+    ninja.write_text(f"#!/bin/sh\necho {version}\n")
+    ninja.chmod(0o755)
+    assert llvm_bench.ninja_quiet_flags(str(ninja)) == expected
+
+
+def test_time_run_pins_via_taskset(tmp_path, monkeypatch):
+    """EVOLVE_BENCH_CPU pins the benchmark with a taskset prefix, not preexec_fn."""
+    cpu = min(os.sched_getaffinity(0))
+    monkeypatch.setenv("EVOLVE_BENCH_CPU", str(cpu))
+    llvm_bench.bench_cpus.cache_clear()
+    llvm_bench._pin_prefix.cache_clear()
+    seen = {}
+
+    def fake_run(cmd, **kwargs):
+        seen.update(cmd=cmd, kwargs=kwargs)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(llvm_bench.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(llvm_bench.subprocess, "run", fake_run)
+    try:
+        assert llvm_bench._time_run(["./bench"], str(tmp_path), None, 10) is not None
+    finally:
+        llvm_bench.bench_cpus.cache_clear()
+        llvm_bench._pin_prefix.cache_clear()
+
+    assert seen["cmd"] == ["/usr/bin/taskset", "-c", str(cpu), "./bench"]
+    assert "preexec_fn" not in seen["kwargs"]
+
+
+def test_ccache_env_single_default_location(tmp_path, monkeypatch):
+    monkeypatch.setattr(llvm_bench.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.delenv("CCACHE_DIR", raising=False)
+    monkeypatch.setenv("CCACHE_MAXSIZE", "1G")
+    env = llvm_bench.ccache_env(str(tmp_path))
+    assert env["CCACHE_DIR"] == os.path.join(str(tmp_path), ".ccache")
+    assert env["CCACHE_MAXSIZE"] == "1G"  # explicit settings win
+
+
+def test_obj_result_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(llvm_bench, "_OBJ_RESULT_CACHE", llvm_bench.collections.OrderedDict())
+    monkeypatch.setattr(llvm_bench, "_OBJ_RESULT_CACHE_MAX", 2)
+    llvm_bench._remember_run("a", "x", 1, 0.1)
+    llvm_bench._remember_run("b", "x", 2, 0.2)
+    assert llvm_bench._recall_run("a") == (1, 0.1)  # "b" is now least recent
+    llvm_bench._remember_run("c", "x", 3, 0.3)
+    assert llvm_bench._recall_run("b") is None
+    assert llvm_bench._recall_run("a") == (1, 0.1)
+    assert len(llvm_bench._OBJ_RESULT_CACHE) == 2
+
+
+# ---------------------------------------------------------------------------
+# ELF text size
+# ---------------------------------------------------------------------------
+
+_SHF_WRITE, _SHF_ALLOC, _SHF_EXEC = 0x1, 0x2, 0x4
+
+
+def _elf(path, sections, is64=True, little=True, extended=False):
+    """Write a minimal relocatable ELF whose section headers are *sections*,
+    a list of ``(flags, size)``; a null section is prepended. With
+    *extended*, e_shnum is 0 and the count lives in shdr[0].sh_size."""
+    end = "<" if little else ">"
+    shdrs = [(0, 0)] + list(sections)
+    if is64:
+        ehdr_fmt, shdr_fmt = end + "16sHHIQQQIHHHHHH", end + "IIQQQQIIQQ"
+    else:
+        ehdr_fmt, shdr_fmt = end + "16sHHIIIIIHHHHHH", end + "IIIIIIIIII"
+    ehsize, shentsize = struct.calcsize(ehdr_fmt), struct.calcsize(shdr_fmt)
+    ident = b"\x7fELF" + bytes([2 if is64 else 1, 1 if little else 2, 1]) + bytes(9)
+    shnum = 0 if extended else len(shdrs)
+    blob = struct.pack(ehdr_fmt, ident, 1, 62, 1, 0, 0, ehsize, 0, ehsize, 0, 0,
+                       shentsize, shnum, 0)
+    for i, (flags, size) in enumerate(shdrs):
+        if i == 0 and extended:
+            size = len(shdrs)
+        blob += struct.pack(shdr_fmt, 0, 1 if i else 0, flags, 0, 0, size, 0, 0, 0, 0)
+    path.write_bytes(blob)
+    return str(path)
+
+
+_SECTIONS = [
+    (_SHF_ALLOC | _SHF_EXEC, 100),   # .text
+    (_SHF_ALLOC, 20),                # .rodata
+    (_SHF_ALLOC | _SHF_WRITE, 50),   # .data: not text
+    (0, 7),                          # .comment: not allocated
+]
+
+
+@pytest.mark.parametrize("is64,little", [(True, True), (True, False), (False, True)])
+def test_elf_text_size_berkeley_rule(tmp_path, is64, little):
+    obj = _elf(tmp_path / "a.o", _SECTIONS, is64=is64, little=little)
+    assert llvm_bench.get_text_size(obj) == 120
+
+
+def test_elf_text_size_extended_section_numbering(tmp_path):
+    """e_shnum == 0 (>= 0xff00 sections): the count comes from shdr[0]."""
+    obj = _elf(tmp_path / "a.o", _SECTIONS, extended=True)
+    assert llvm_bench.get_text_size(obj) == 120
+
+
+def test_get_text_size_falls_back_to_file_size(tmp_path):
+    junk = tmp_path / "a.o"
+    junk.write_bytes(b"not an object")
+    assert llvm_bench.get_text_size(str(junk)) == len(b"not an object")
+    assert llvm_bench.get_text_size(str(tmp_path / "missing.o")) == 0
+
+
+@pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("size")),
+                    reason="needs gcc and binutils size")
+def test_elf_text_size_matches_binutils(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("const int k[64] = {1};\nint f(int x) { return x * k[x & 63]; }\n"
+                   "int g(int x) { return f(x) + 1; }\n")
+    obj = tmp_path / "a.o"
+    subprocess.run(["gcc", "-c", "-O1", "-ffunction-sections", str(src), "-o", str(obj)],
+                   check=True)
+    out = subprocess.run(["size", str(obj)], capture_output=True, text=True, check=True)
+    assert llvm_bench.get_text_size(str(obj)) == int(out.stdout.splitlines()[1].split()[0])
+
+
+# ---------------------------------------------------------------------------
+# patch_source / restore_source
+# ---------------------------------------------------------------------------
+
+def _patch_config(tmp_path):
+    (tmp_path / "llvm" / "lib").mkdir(parents=True)
+    return llvm_bench.EvalConfig(llvm_src=str(tmp_path / "llvm"), target_file="lib/H.cpp",
+                                 testsuite_dir=str(tmp_path / "ts"))
+
+
+def test_patch_and_restore_source(tmp_path):
+    config = _patch_config(tmp_path)
+    target = tmp_path / "llvm" / "lib" / "H.cpp"
+    target.write_text("original")
+    candidate = tmp_path / "cand.cpp"
+    candidate.write_text("evolved")
+
+    dest, backup = llvm_bench.patch_source(str(candidate), config)
+
+    assert target.read_text() == "evolved"
+    # The candidate was renamed over dest, not written into the original
+    # inode the backup hard-links to
+    assert open(backup).read() == "original"
+    assert not list(target.parent.glob("*.tmp"))
+
+    llvm_bench.restore_source(dest, backup)
+    assert target.read_text() == "original"
+    assert not os.path.exists(backup)
+
+
+def test_patch_source_keeps_backup_of_interrupted_run(tmp_path):
+    """A leftover backup holds the real original; dest holds a stale candidate."""
+    config = _patch_config(tmp_path)
+    target = tmp_path / "llvm" / "lib" / "H.cpp"
+    target.write_text("stale candidate")
+    (tmp_path / "llvm" / "lib" / "H.cpp.evolve.bak").write_text("original")
+    candidate = tmp_path / "cand.cpp"
+    candidate.write_text("evolved")
+
+    dest, backup = llvm_bench.patch_source(str(candidate), config)
+    assert open(backup).read() == "original"
+
+    llvm_bench.restore_source(dest, backup)
+    assert target.read_text() == "original"
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def result_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVOLVE_RUNTIME_METRIC", "seconds")
+    monkeypatch.delenv("EVOLVE_DISABLE_PERF", raising=False)
+    monkeypatch.delenv("EVOLVE_BENCH_CPU", raising=False)
+    llvm_bench.runtime_metric.cache_clear()
+    llvm_bench.bench_cpus.cache_clear()
+    ts = tmp_path / "ts"
+    ts.mkdir()
+    (ts / "bench.bc").write_bytes(b"bitcode")
+    yield llvm_bench.EvalConfig(testsuite_dir=str(ts), result_cache=str(tmp_path / "cache"),
+                                result_cache_max=2)
+    llvm_bench.runtime_metric.cache_clear()
+    llvm_bench.bench_cpus.cache_clear()
+
+
+def _program(tmp_path, text):
+    path = tmp_path / f"{text}.cpp"
+    path.write_text(text)
+    return str(path)
+
+
+def test_result_cache_round_trip(tmp_path, result_config):
+    prog = _program(tmp_path, "a")
+    assert llvm_bench.load_cached_result(prog, result_config) is None
+    llvm_bench.store_cached_result(prog, result_config, {"combined_score": 1.5})
+    assert llvm_bench.load_cached_result(prog, result_config) == {"combined_score": 1.5}
+    assert llvm_bench.load_cached_result(_program(tmp_path, "b"), result_config) is None
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path, result_config):
+    a, b, c = (_program(tmp_path, t) for t in "abc")
+    llvm_bench.store_cached_result(a, result_config, {"s": "a"})
+    llvm_bench.store_cached_result(b, result_config, {"s": "b"})
+    now = time.time()
+    os.utime(llvm_bench._result_path(a, result_config), (now - 200, now - 200))
+    os.utime(llvm_bench._result_path(b, result_config), (now - 100, now - 100))
+
+    assert llvm_bench.load_cached_result(a, result_config) == {"s": "a"}  # refreshes a
+    llvm_bench.store_cached_result(c, result_config, {"s": "c"})
+
+    assert llvm_bench.load_cached_result(b, result_config) is None
+    assert llvm_bench.load_cached_result(a, result_config) == {"s": "a"}
+    assert llvm_bench.load_cached_result(c, result_config) == {"s": "c"}
+
+
+def test_result_cache_skips_incomplete_results(tmp_path, result_config):
+    """A timed-out benchmark run (no runtime/speedup, no error) is not cached."""
+    prog = _program(tmp_path, "a")
+    timed_out = {"error": None, "benchmark_details": {
+        "7zip.bc": {"text_size": 1, "runtime": None},
+        "unconfigured.bc": {"text_size": 1, "runtime": None},
+    }}
+    llvm_bench.store_cached_result(prog, result_config, timed_out)
+    assert llvm_bench.load_cached_result(prog, result_config) is None
+
+    timed_out["benchmark_details"]["7zip.bc"].update(runtime=1.0, speedup=1.1)
+    llvm_bench.store_cached_result(prog, result_config, timed_out)
+    assert llvm_bench.load_cached_result(prog, result_config) == timed_out
+
+
+def test_result_cache_disabled(tmp_path, result_config):
+    result_config.result_cache_max = 0
+    prog = _program(tmp_path, "a")
+    llvm_bench.store_cached_result(prog, result_config, {"s": 1})
+    assert llvm_bench.load_cached_result(prog, result_config) is None
+    assert not os.path.exists(result_config.result_cache)
+
+
+# ---------------------------------------------------------------------------
+# evolve-worker pool
+# ---------------------------------------------------------------------------
+
+def _worker(tmp_path, body):
+    """Fake evolve-worker: logs each start, then runs *body* (sh) on stdin."""
+    starts = tmp_path / "starts"
+    worker = tmp_path / "worker"
+    worker.write_text(f"#!/bin/sh\necho start >> '{starts}'\n{body}")
+    worker.chmod(0o755)
+    return str(worker), starts
+
+
+@pytest.fixture
+def pool():
+    pool = llvm_bench._WorkerPool()
+    yield pool
+    pool.close()
+
+
+def test_worker_pool_reuses_worker(tmp_path, pool):
+    worker, starts = _worker(tmp_path, "while read line; do echo ok; done\n")
+    for _ in range(3):
+        assert pool.compile(worker, ["-x"], "a.bc", "a.o", 10) is None
+    assert _ncalls(starts) == 1
+
+
+def test_worker_pool_reports_compile_error(tmp_path, pool):
+    worker, _ = _worker(tmp_path, "while read line; do echo 'error bad IR'; done\n")
+    assert pool.compile(worker, [], "a.bc", "a.o", 10) == "bad IR"
+
+
+def test_worker_pool_replaces_crashed_worker(tmp_path, pool):
+    """A worker killed by the evolved code fails that request only."""
+    worker, starts = _worker(tmp_path, "read line\nexit 3\n")
+    assert pool.compile(worker, [], "a.bc", "a.o", 10) == "worker exited with 3"
+    assert pool.compile(worker, [], "a.bc", "a.o", 10) == "worker exited with 3"
+    assert _ncalls(starts) == 2
+
+
+def test_worker_pool_reports_unusable_worker(tmp_path, pool):
+    """A missing or non-executable EVOLVE_WORKER fails the compile, not the run."""
+    err = pool.compile(str(tmp_path / "missing"), [], "a.bc", "a.o", 10)
+    assert err.startswith("worker unavailable:")
+    worker = tmp_path / "worker"
+    worker.write_text("#!/bin/sh\n")
+    worker.chmod(0o644)
+    err = pool.compile(str(worker), [], "a.bc", "a.o", 10)
+    assert err.startswith("worker failed to start:")
+
+
+def test_worker_pool_times_out_hung_worker(tmp_path, pool):
+    worker, _ = _worker(tmp_path, "read line\nexec sleep 30\n")
+    assert pool.compile(worker, [], "a.bc", "a.o", 0.2) == "worker timed out (0.2s)"
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+def test_baseline_records_failures_so_they_are_not_recompiled(
+        tmp_path, result_config, monkeypatch):
+    ts = Path(result_config.testsuite_dir)
+    (ts / "other.bc").write_bytes(b"more bitcode")
+    result_config.baseline_file = str(tmp_path / "baseline.json")
+    compiled = []
+
+    def fake_compile(benchmarks, *args, on_result=None, **kwargs):
+        for bc in benchmarks:
+            compiled.append(bc.name)
+            on_result(bc, (None, None, None, "opt failed") if bc.stem == "bench"
+                      else (100, 200, 1.0, None))
+
+    monkeypatch.setattr(llvm_bench, "compile_benchmarks", fake_compile)
+    monkeypatch.setattr(llvm_bench, "warm_data", lambda *a: None)
+
+    first = llvm_bench.load_baseline(result_config)
+    assert set(first) == {"other.bc"}
+    # The failure is cached: a prefetch hits and nothing is recompiled
+    assert llvm_bench.load_baseline(result_config, cached_only=True) == first
+    assert llvm_bench.load_baseline(result_config) == first
+    assert sorted(compiled) == ["bench.bc", "other.bc"]
+
+
+# ---------------------------------------------------------------------------
+# opt | llc pipe
+# ---------------------------------------------------------------------------
+
+def _sh(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text("#!/bin/sh\n" + body)
+    path.chmod(0o755)
+    return [str(path)]
+
+
+def test_pipe_reports_llc_error_when_opt_dies_of_broken_pipe(tmp_path):
+    opt = _sh(tmp_path, "opt", "exec yes\n")  # killed by SIGPIPE once llc exits
+    llc = _sh(tmp_path, "llc", "head -c1 >/dev/null\necho 'llc: bad IR' >&2\nexit 1\n")
+    assert llvm_bench._pipe_opt_llc(opt, llc, 10) == "llc: bad IR\n"
+
+
+def test_pipe_reports_opt_error_first(tmp_path):
+    opt = _sh(tmp_path, "opt", "echo 'opt: crash' >&2\nexit 1\n")
+    llc = _sh(tmp_path, "llc", "cat >/dev/null\necho 'llc: truncated' >&2\nexit 1\n")
+    assert llvm_bench._pipe_opt_llc(opt, llc, 10) == "opt: crash\n"
+
+
+def test_pipe_timeout_covers_whole_pipeline(tmp_path):
+    opt = _sh(tmp_path, "opt", "exec sleep 0.8\n")
+    llc = _sh(tmp_path, "llc", "cat >/dev/null\nexec sleep 30\n")
+    start = time.monotonic()
+    assert llvm_bench._pipe_opt_llc(opt, llc, 1) == "llc timed out (1s)"
+    assert time.monotonic() - start < 1.5